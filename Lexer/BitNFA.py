@@ -0,0 +1,95 @@
+import bisect
+import FiniteAutomaton as FA
+
+# states are packed into python integers, bit s is set if nfa state s is active
+CHUNK: int = 8
+BITS: int = (1 << CHUNK) - 1
+
+class BitNFA:
+
+    alphabet: str
+    lookup: dict[str, int]
+
+    # successors[class][s] is the epsilon closed successor set of state s, states without edges are left out
+    successors: list[dict[int, int]]
+
+    # steps[class][k << CHUNK | b] is the union of the successors of the states in chunk k having bits b,
+    # entries are filled the first time a run reaches them
+    steps: list[dict[int, int]]
+    start: int
+    accept: int
+
+    def __init__(self, fa: FA.FiniteAutomaton, alphabet: str) -> None:
+
+        self.alphabet = alphabet
+        classes: list[int] = fa.char_classes(alphabet)
+        self.lookup = {}
+        representatives: dict[int, str] = {}
+        for c, i in zip(alphabet, classes):
+            representatives.setdefault(i, c)
+        numbers: dict[int, int] = {i: n for n, i in enumerate(representatives)}
+        for c, i in zip(alphabet, classes):
+            self.lookup.setdefault(c, numbers[i])
+
+        self.start = self.mask(fa.closure(fa.start))
+        self.accept = self.mask(set(fa.end))
+
+        # one closure per state, shared by every class
+        fa.compile()
+        closed: list[int] = [self.mask(fa.state_closure(s)) for s in range(fa.size)]
+
+        # every edge is visited once, it covers the classes whose representative lies in its range
+        codes: list[tuple[int, int]] = sorted((ord(c), n) for n, c in enumerate(representatives.values()))
+        ords: list[int] = [o for o, n in codes]
+        self.successors = [{} for x in codes]
+        for s in range(fa.size):
+            for k in range(fa.offsets[s], fa.offsets[s + 1]):
+                target: int = closed[fa.targets[k]]
+                for j in range(bisect.bisect_left(ords, fa.lows[k]), bisect.bisect_right(ords, fa.highs[k])):
+                    successor: dict[int, int] = self.successors[codes[j][1]]
+                    successor[s] = successor.get(s, 0) | target
+
+        self.steps = [{} for x in codes]
+
+    @staticmethod
+    def mask(states: set[int]) -> int:
+        result: int = 0
+        for s in states:
+            result |= 1 << s
+        return result
+
+    # union of the successors of the set bits, lowest bit first
+    def __fill(self, i: int, key: int) -> int:
+        successor: dict[int, int] = self.successors[i]
+        offset: int = (key >> CHUNK) * CHUNK
+        b: int = key & BITS
+        result: int = 0
+        while b:
+            low: int = b & -b
+            result |= successor.get(offset + low.bit_length() - 1, 0)
+            b ^= low
+        self.steps[i][key] = result
+        return result
+
+    def run(self, word: str) -> bool:
+
+        current: int = self.start
+        for c in word:
+            i: int = self.lookup.get(c, -1)
+            if i == -1: return False
+            step: dict[int, int] = self.steps[i]
+
+            # one table lookup per chunk of active states
+            following: int = 0
+            k: int = 0
+            while current:
+                b: int = current & BITS
+                if b:
+                    found: int | None = step.get(k | b)
+                    following |= self.__fill(i, k | b) if found is None else found
+                current >>= CHUNK
+                k += 1 << CHUNK
+            current = following
+            if not current: return False
+
+        return current & self.accept != 0
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from typing import Callable, Generic, TypeVar
+import os
+import pathlib
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# generated tables and dfas are cached outside the source tree, XDG_CACHE_HOME is honoured
+CACHE_DIRECTORY: pathlib.Path = pathlib.Path(os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache") / "Lexer"
+
+# least recently used cache with a bounded number of entries
+class LRUCache(Generic[K, V]):
+
+    size: int
+    entries: OrderedDict[K, V]
+
+    def __init__(self, size: int) -> None:
+        assert size > 0
+        self.size = size
+        self.entries = OrderedDict()
+
+    def __contains__(self, key: K) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        if not key in self.entries: return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: K, value: V) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+
+        # evict the least recently used entries
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def get_or_build(self, key: K, build: Callable[[K], V]) -> V:
+        if key in self.entries: return self.get(key)
+        value: V = build(key)
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+
+# handle that builds its value on first use and forwards attribute access to it
+class Lazy(Generic[V]):
+
+    __build: Callable[[], V] | None
+    __value: V | None
+
+    def __init__(self, build: Callable[[], V]) -> None:
+        self.__build = build
+        self.__value = None
+
+    def get(self) -> V:
+        state: dict = self.__dict__
+        if state["_Lazy__build"] is not None:
+            state["_Lazy__value"] = state["_Lazy__build"]()
+            state["_Lazy__build"] = None
+        return state["_Lazy__value"]
+
+    # only called for names the handle lacks. special and private names are never forwarded, copy and pickle
+    # look them up on instances whose state is not restored yet
+    def __getattr__(self, name: str):
+        if name.startswith("__") or name.startswith("_Lazy__"):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+    # copies and pickles carry the built value, the build function may be a lambda
+    def __getstate__(self) -> dict:
+        return {"_Lazy__build": None, "_Lazy__value": self.get()}
+
+
+
+# arrays are written one after another like np.save does, the file appears under its name at once
+def save_arrays(path: pathlib.Path, arrays: list) -> None:
+
+    # numpy is imported here so that importing this module stays cheap
+    import numpy as np
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # write next to the target and rename, concurrent readers never see partial files
+    temporary: pathlib.Path = path.with_name(path.name + "." + str(os.getpid()) + ".tmp")
+    try:
+        with open(temporary, 'wb') as f:
+            for array in arrays:
+                np.save(f, array)
+        os.replace(temporary, path)
+    except BaseException:
+        # a failed write leaves nothing behind
+        temporary.unlink(missing_ok=True)
+        raise
+
+# keeps the limit most recently used files of a cache directory, entries orphaned by version or grammar changes go first
+def prune(directory: pathlib.Path, limit: int) -> None:
+    files: list[pathlib.Path] = sorted(directory.glob("*.npy"), key=lambda x: x.stat().st_mtime, reverse=True)
+    for path in files[limit:]:
+        path.unlink(missing_ok=True)
+
+# entry of a cache directory holding at most limit files. missing, truncated or otherwise unreadable
+# entries (and the ones load rejects with None) are built again and stored
+def load_or_build(path: pathlib.Path, load: Callable[[pathlib.Path], V | None], build: Callable[[], V], save: Callable[[pathlib.Path, V], None], limit: int) -> V:
+
+    try:
+        value: V | None = load(path)
+    except (OSError, ValueError, EOFError):
+        value = None
+
+    if value is not None:
+        # loading counts as use for pruning
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    value = build()
+
+    # the cache is optional, an unwritable directory only costs a rebuild next time
+    try:
+        save(path, value)
+        prune(path.parent, limit)
+    except OSError:
+        pass
+    return value
@@ -1,51 +1,220 @@
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
 import numpy as np
 import pathlib
+import RegexGrammar as RG
+import RegexParser as RP
 import RegexToFA as R2FA
+from typing import Callable
+from Cache import CACHE_DIRECTORY, Lazy, LRUCache, load_or_build, prune, save_arrays
+
+# compiled dfas are stored under a hash of everything they depend on, loaded ones are also kept in memory
+# the ones shipped with the sources are read from DFA_DIRECTORY, everything else goes to the cache directory
+DFA_VERSION: str = "1"
+DFA_DIRECTORY: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "dfa"
+DFA_CACHE_DIRECTORY: pathlib.Path = CACHE_DIRECTORY / "dfa"
+DFA_CACHE_FILES: int = 256
+DFA_CACHE_SIZE: int = 64
+
+# the grammar decides how a regex is read, its hash is remembered per alphabet
+# the layout of parse tables does not matter here, so their version is not part of it
+__grammar_hashes: LRUCache[str, str] = LRUCache(RG.GRAMMAR_CACHE_SIZE)
+
+def dfa_hash(regex: str, alphabet: str) -> str:
+    h = hashlib.sha256(DFA_VERSION.encode())
+    grammar: str = __grammar_hashes.get_or_build(RG.alphabet_key(alphabet), lambda x: RP.grammar_hash(RG.regex_rules(x), RG.starting_rule.lhs))
+    h.update(b"\0" + grammar.encode())
+    h.update(b"\0" + regex.encode() + b"\0" + alphabet.encode())
+    return h.hexdigest()
+
+# the arrays stored for a dfa: alphabet, transitions per class, accept, reject and the class of every character
+def compile_arrays(regex: str, alphabet: str) -> list[np.ndarray]:
+    x = R2FA.regex2FA(regex, alphabet)
+    transitions, accept, reject = R2FA.FA.fa2dfa(x, alphabet)
+    classes, transitions = R2FA.FA.alphabet_classes(transitions)
+    return [
+        np.array(alphabet),
+        np.array(transitions, dtype=np.int32),
+        np.array(accept, dtype=np.int64),
+        np.array(reject, dtype=np.int64),
+        np.array(classes, dtype=np.int64)
+    ]
+
+def load_arrays(path: pathlib.Path) -> list[np.ndarray]:
+    with open(path, 'rb') as f:
+        arrays: list[np.ndarray] = [np.load(f) for x in range(4)]
+        try:
+            arrays.append(np.load(f))
+        except EOFError:
+            # tables written before alphabet compression have one column per character
+            arrays.append(np.arange(len(arrays[0].item())))
+    return arrays
 
 class DFA:
     
     alphabet: str
-    transitions: list[list[int]]
+    transitions: np.ndarray
     accept: list[int]
     reject: list[int]
+
+    # classes[i] is the transition column of alphabet[i], lookup maps a code point to its column or -1
+    classes: list[int]
+    lookup: np.ndarray
+
+    # per state flags, dead is set if no accepting state can be reached
+    accepting: np.ndarray
+    dead: np.ndarray
+
+    # transitions with an extra error state and an extra column for characters outside the alphabet
+    __table: np.ndarray
+    __columns: np.ndarray
+
+    # plain list copies for run, indexing lists is cheaper than numpy item calls for one word at a time
+    __rows: list[list[int]]
+    __codes: list[int]
+    __accepting: list[bool]
+    __dead: list[bool]
+
+    __loaded: LRUCache[str, "DFA"] = LRUCache(DFA_CACHE_SIZE)
     
-    def __init__(self, path: str, regex: str | None = None, alphabet: str | None = None) -> None:
-        
-        path = pathlib.Path(path)
-        
-        if path.is_file():
-            
-            with open(path, 'rb') as f:
-                self.alphabet = np.load(f).tolist()
-                self.transitions = np.load(f).tolist()
-                self.accept = np.load(f).tolist()
-                self.reject = np.load(f).tolist()
-        
-        else:
-            self.alphabet = alphabet
-            x = R2FA.regex2FA(regex, alphabet)
-            self.transitions, self.accept, self.reject = R2FA.FA.fa2dfa(x, alphabet)
-            
-            # save to file
-            with open(path, '+wb') as f:
-                np.save(f, self.alphabet)
-                np.save(f, self.transitions)
-                np.save(f, self.accept)
-                np.save(f, self.reject)
+    # DFA(regex, alphabet) goes through the cache, DFA(path=...) reads a file as it is
+    def __init__(self, regex: str | None = None, alphabet: str | None = None, *, path: str | None = None) -> None:
+
+        if regex is None:
+            self.__assign(load_arrays(pathlib.Path(path)))
+            self.__setup()
+            return
+
+        if alphabet is None:
+            raise TypeError("a dfa is built from a regex and its alphabet, files are read with DFA(path=...)")
+
+        key: str = dfa_hash(regex, alphabet)
+        loaded: DFA | None = self.__loaded.get(key)
+        if loaded is not None:
+            self.__dict__.update(loaded.__dict__)
+            return
+
+        # a shipped dfa is read in place of the cache entry
+        shipped: pathlib.Path = DFA_DIRECTORY / (key + ".npy")
+        load: Callable[[pathlib.Path], list[np.ndarray]] = lambda x: load_arrays(shipped if shipped.is_file() else x)
+        self.__assign(load_or_build(DFA_CACHE_DIRECTORY / (key + ".npy"), load, lambda: compile_arrays(regex, alphabet), save_arrays, DFA_CACHE_FILES))
+
+        self.__setup()
+        self.__loaded.put(key, self)
+
+    def __assign(self, arrays: list[np.ndarray]) -> None:
+        self.alphabet = arrays[0].item()
+        self.transitions = arrays[1].astype(np.int32)
+        self.accept = arrays[2].tolist()
+        self.reject = arrays[3].tolist()
+        self.classes = arrays[4].tolist()
+
+    def __setup(self) -> None:
+
+        self.lookup = np.full(max([ord(c) + 1 for c in self.alphabet], default=0), -1, dtype=np.int32)
+        for c, i in reversed(list(zip(self.alphabet, self.classes))):
+            self.lookup[ord(c)] = i
+
+        states, width = self.transitions.shape
+        self.accepting = np.zeros(states, dtype=bool)
+        self.accepting[self.accept] = True
+        self.dead = np.zeros(states, dtype=bool)
+        self.dead[self.reject] = True
+
+        self.__table = np.full((states + 1, width + 1), states, dtype=np.int32)
+        self.__table[:states, :width] = self.transitions
+        self.__columns = np.append(np.where(self.lookup == -1, width, self.lookup), width).astype(np.int32)
+
+        self.__rows = self.transitions.tolist()
+        self.__codes = self.lookup.tolist()
+        self.__accepting = self.accepting.tolist()
+        self.__dead = self.dead.tolist()
     
     def run(self, word: str) -> bool:
-        
+
+        rows: list[list[int]] = self.__rows
+        codes: list[int] = self.__codes
+        dead: list[bool] = self.__dead
+
         state: int = 0
         for c in word:
-            
-            i: int = self.alphabet.find(c)
-            
+
+            o: int = ord(c)
+            if o >= len(codes): return False
+            i: int = codes[o]
+
             if i == -1: return False
-            state = self.transitions[state][i]
-            if state in self.reject: return False
-        
-        return state in self.accept
+            state = rows[state][i]
+            if dead[state]: return False
+
+        return self.__accepting[state]
+
+    def run_many(self, words: list[str], batch: int = 1 << 16) -> np.ndarray:
+
+        words = list(words)
+        result: np.ndarray = np.zeros(len(words), dtype=bool)
+        for i in range(0, len(words), batch):
+            result[i:i + batch] = self.__run_batch(words[i:i + batch])
+        return result
+
+    def __run_batch(self, words: list[str]) -> np.ndarray:
+
+        if not words: return np.zeros(0, dtype=bool)
+
+        # longest words first, the words still running at step j are always a prefix
+        lengths: np.ndarray = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        order: np.ndarray = np.argsort(-lengths, kind="stable")
+        lengths = lengths[order]
+        starts: np.ndarray = np.cumsum(lengths) - lengths
+
+        # column of every character of all words laid out one after another
+        codes: np.ndarray = np.frombuffer("".join([words[k] for k in order]).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        columns: np.ndarray = self.__columns[np.minimum(codes, len(self.__columns) - 1)]
+
+        states: np.ndarray = np.zeros(len(words), dtype=np.int32)
+        for j in range(int(lengths[0])):
+            running: int = int(np.searchsorted(-lengths, -j, side="left"))
+            states[:running] = self.__table[states[:running], columns[starts[:running] + j]]
+
+        result: np.ndarray = np.zeros(len(words), dtype=bool)
+        result[order] = np.append(self.accepting, False)[states]
+        return result
+
+# compiles the regexes missing from the cache in worker processes, returns one dfa per (regex, alphabet)
+def compile_many(tokens: list[tuple[str, str]], workers: int | None = None) -> list[DFA]:
+
+    missing: dict[str, tuple[str, str]] = {}
+    for regex, alphabet in tokens:
+        key: str = dfa_hash(regex, alphabet)
+        name: str = key + ".npy"
+        if not key in missing and not (DFA_DIRECTORY / name).is_file() and not (DFA_CACHE_DIRECTORY / name).is_file():
+            missing[key] = (regex, alphabet)
+
+    if missing:
+
+        # every parse table is built here once before the pool starts, forked workers inherit it
+        # and spawned ones find it in the table cache
+        for alphabet in set(RG.alphabet_key(alphabet) for regex, alphabet in missing.values()):
+            RP.regex_table(alphabet)
+
+        with ProcessPoolExecutor(workers) as pool:
+
+            # results are merged into the cache by this process only, a dfa that could not be
+            # stored is compiled again below
+            futures = {key: pool.submit(compile_arrays, regex, alphabet) for key, (regex, alphabet) in missing.items()}
+            try:
+                for key, future in futures.items():
+                    save_arrays(DFA_CACHE_DIRECTORY / (key + ".npy"), future.result())
+                prune(DFA_CACHE_DIRECTORY, DFA_CACHE_FILES)
+            except OSError:
+                pass
+
+    return [DFA(regex, alphabet) for regex, alphabet in tokens]
 
-identifier = DFA("dfa/identifier_dfa.npy", "(([[a]-[z]]|[[A]-[Z]]|[_])+)(([[a]-[z]]|[[A]-[Z]]|[[0]-[9]]|[_])*)", "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
-integer = DFA("dfa/integer.npy","(([-]|[+])?)((([0]([x]|[X]))((([_]?)([[0]-[9]]|[[a]-[f]]|[[A]-[F]]))+))|(([0]([b]|[B]))((([_]?)([0]|[1]))+))|(([0]([o]|[O]))((([_]?)([[0]-[7]]))+))|(([[1]-[9]]+)(([_]?)([[0]-[9]]))*))", "0123456789abcdefABCDEFxXoO_+-")
+# token definitions as (regex, alphabet)
+IDENTIFIER: tuple[str, str] = ("(([[a]-[z]]|[[A]-[Z]]|[_])+)(([[a]-[z]]|[[A]-[Z]]|[[0]-[9]]|[_])*)", "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
+INTEGER: tuple[str, str] = ("(([-]|[+])?)((([0]([x]|[X]))((([_]?)([[0]-[9]]|[[a]-[f]]|[[A]-[F]]))+))|(([0]([b]|[B]))((([_]?)([0]|[1]))+))|(([0]([o]|[O]))((([_]?)([[0]-[7]]))+))|(([[1]-[9]]+)(([_]?)([[0]-[9]]))*))", "0123456789abcdefABCDEFxXoO_+-")
 
+# built or loaded on first use
+identifier: Lazy[DFA] = Lazy(lambda: DFA(*IDENTIFIER))
+integer: Lazy[DFA] = Lazy(lambda: DFA(*INTEGER))
@@ -1,65 +1,138 @@
 from typing import Self
+import numpy as np
 
-class Node:
-
-    id: int
-    transitions: list[tuple[str, int]]
-
-    def __init__(self, id: int, transitions: list[tuple[str, int]] = []) -> None:
-        self.id = id
-        self.transitions = []# transitions
+# label of epsilon edges, all other edges accept the characters low..high
+EPSILON: int = -1
 
 class FiniteAutomaton:
 
-    nodes: list[Node] = []
+    size: int = 0
     start: int | None = None
     end: list[int] = []
 
+    # one column (source, target, low, high) per edge, edges added since the last compile wait in pending
+    edges: np.ndarray
+    pending: list[tuple[int, int, int, int]] = []
+
+    # compressed sparse rows built by compile, epsilon edges are kept apart from the labelled ones
+    offsets: list[int] | None = None
+    targets: list[int] = []
+    lows: list[int] = []
+    highs: list[int] = []
+    epsilon_offsets: list[int] = []
+    epsilon_targets: list[int] = []
+    closures: dict[int, frozenset[int]] = {}
+
     is_dfa: bool = False
 
     def __init__(self) -> None:
-        self.nodes = []
+        self.size = 0
         self.start = None
         self.end = []
+        self.edges = np.zeros((4, 0), dtype=np.int32)
+        self.pending = []
+        self.offsets = None
+        self.closures = {}
         self.is_dfa = False
 
     def add_node(self) -> None:
-        x = len(self.nodes)
-        self.nodes.append(Node(x))
+        self.size += 1
+        self.offsets = None
+    def add_range(self, source: int, target: int, low: int, high: int) -> None:
+        self.pending.append((source, target, low, high))
+        self.offsets = None
     def add_transition(self, source: int, target: int, char: str) -> None:
-        self.nodes[source].transitions.append((char, target))
+        if char == "":
+            self.add_range(source, target, EPSILON, EPSILON)
+        else:
+            self.add_range(source, target, ord(char), ord(char))
     def define_start(self, id: int) -> None:
         self.start = id
     def define_end(self, id: int) -> None:
         self.end.append(id)
-    
+
+    def edge_array(self) -> np.ndarray:
+        if self.pending:
+            self.edges = np.concatenate([self.edges, np.array(self.pending, dtype=np.int32).reshape(-1, 4).T], axis=1)
+            self.pending = []
+        return self.edges
+
+    def compile(self) -> None:
+
+        if self.offsets is not None: return
+
+        edges: np.ndarray = self.edge_array()
+        epsilon: np.ndarray = edges[2] == EPSILON
+
+        def rows(sources: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            order = np.argsort(sources, kind="stable")
+            offsets = np.zeros(self.size + 1, dtype=np.int32)
+            np.cumsum(np.bincount(sources, minlength=self.size), out=offsets[1:])
+            return offsets, order
+
+        offsets, order = rows(edges[0, ~epsilon])
+        self.targets = edges[1, ~epsilon][order].tolist()
+        self.lows = edges[2, ~epsilon][order].tolist()
+        self.highs = edges[3, ~epsilon][order].tolist()
+        self.offsets = offsets.tolist()
+
+        offsets, order = rows(edges[0, epsilon])
+        self.epsilon_targets = edges[1, epsilon][order].tolist()
+        self.epsilon_offsets = offsets.tolist()
+
+        self.closures = {}
+
+    def state_closure(self, state: int) -> frozenset[int]:
+
+        self.compile()
+        if state in self.closures:
+            return self.closures[state]
+
+        # breadth first search along the epsilon edges
+        result: set[int] = set([state])
+        worklist: list[int] = [state]
+        while worklist:
+            i = worklist.pop()
+            for k in range(self.epsilon_offsets[i], self.epsilon_offsets[i + 1]):
+                x = self.epsilon_targets[k]
+                if not x in result:
+                    result.add(x)
+                    worklist.append(x)
+
+        self.closures[state] = frozenset(result)
+        return self.closures[state]
+
     def closure(self, start: int | set[int]) -> set[int]:
 
         if isinstance(start, int):
-            result = set([start])
-        else:
-            result = set(start)
-
-        while True:
-            n = set(result)
-            for i in result:
-                for c, x in self.nodes[i].transitions:
-                    if c == "":
-                        n.add(x)
-            if n.issubset(result):
-                return result
-            result.update(n)
+            return set(self.state_closure(start))
+
+        result: set[int] = set()
+        for i in start:
+            # the closure of a reached state is already part of the result
+            if not i in result:
+                result.update(self.state_closure(i))
+        return result
     
     def next_state(self, start: set[int], token: str) -> set[int]:
 
+        self.compile()
+        o: int = ord(token)
+
         result = set()
-        
         for i in start:
-            for c, x in self.nodes[i].transitions:
-                if c == token:
-                    result.add(x)
+            for k in range(self.offsets[i], self.offsets[i + 1]):
+                if self.lows[k] <= o <= self.highs[k]:
+                    result.add(self.targets[k])
         return self.closure(result)
 
+    # characters lying between the same range bounds are on exactly the same edges
+    def char_classes(self, alphabet: str) -> list[int]:
+        edges: np.ndarray = self.edge_array()
+        labelled: np.ndarray = edges[:, edges[2] != EPSILON]
+        bounds: np.ndarray = np.unique(np.concatenate([labelled[2], labelled[3] + 1]))
+        return np.searchsorted(bounds, [ord(c) for c in alphabet], side="right").tolist()
+
     def accepts(self, value: set[int]) -> bool:
         for s in value:
             if s in self.end:
@@ -68,105 +141,75 @@ class FiniteAutomaton:
             
 
 
-
-def char_accepter(char: str) -> FiniteAutomaton:
+# new automaton holding copies of all parts, the states of every part are shifted behind the previous ones
+def splice(*parts: FiniteAutomaton) -> FiniteAutomaton:
     fa = FiniteAutomaton()
-    fa.add_node()
-    fa.add_node()
-    fa.add_transition(0, 1, char)
-    fa.define_start(0)
-    fa.define_end(1)
 
+    edges: list[np.ndarray] = []
+    for part in parts:
+        e = part.edge_array().copy()
+        e[:2] += fa.size
+        edges.append(e)
+        fa.size += part.size
+
+    fa.edges = np.concatenate(edges, axis=1)
     return fa
 
+def char_accepter(char: str) -> FiniteAutomaton:
+    return spread_accepter(char, char)
+
 def spread_accepter(char1: str, char2: str) -> FiniteAutomaton:
     fa = FiniteAutomaton()
     fa.add_node()
     fa.add_node()
-    i = ord(char1)
-    while i <= ord(char2):
-        fa.add_transition(0, 1, chr(i))
-        i += 1
+    fa.add_range(0, 1, ord(char1), ord(char2))
     fa.define_start(0)
     fa.define_end(1)
     
     return fa
 
 def concat_accepter(fa0: FiniteAutomaton, fa1: FiniteAutomaton) -> FiniteAutomaton:
-    # create new empty fa
-    fa = FiniteAutomaton()
+    # copy both automata into a new one
+    fa = splice(fa0, fa1)
 
-    # add all nodes to fa
-    for i in range(len(fa0.nodes) + len(fa1.nodes)):
-        fa.add_node()
-    
-    # add all old transitions to fa
-    for n in fa0.nodes:
-        for c, id in n.transitions:
-            fa.add_transition(n.id, id, c)
-    for n in fa1.nodes:
-        for c, id in n.transitions:
-            fa.add_transition(n.id + len(fa0.nodes), id + len(fa0.nodes), c)
-    
     # define the same start
     fa.define_start(fa0.start)
 
     # add epsilon transition to next start state
     for id in fa0.end:
-        fa.add_transition(id, fa1.start + len(fa0.nodes), "")
+        fa.add_transition(id, fa1.start + fa0.size, "")
     
     # define ends
     for id in fa1.end:
-        fa.define_end(len(fa0.nodes) + id)
+        fa.define_end(fa0.size + id)
     
     return fa
 
 
 
 def choice_accepter(fa0: FiniteAutomaton, fa1: FiniteAutomaton) -> FiniteAutomaton:
-    # create new empty fa
-    fa = FiniteAutomaton()
-
-    # add all nodes to fa
-    for i in range(len(fa0.nodes) + len(fa1.nodes)):
-        fa.add_node()
-    
-    # add all old transitions to fa
-    for n in fa0.nodes:
-        for c, id in n.transitions:
-            fa.add_transition(n.id, id, c)
-    for n in fa1.nodes:
-        for c, id in n.transitions:
-            fa.add_transition(n.id + len(fa0.nodes), id + len(fa0.nodes), c)
+    # copy both automata into a new one
+    fa = splice(fa0, fa1)
     
     # define new start and add epsilon transitions
     fa.add_node()
-    fa.define_start(len(fa0.nodes) + len(fa1.nodes))
-    fa.add_transition(len(fa0.nodes) + len(fa1.nodes), fa0.start, "")
-    fa.add_transition(len(fa0.nodes) + len(fa1.nodes), fa1.start + len(fa0.nodes), "")
+    fa.define_start(fa0.size + fa1.size)
+    fa.add_transition(fa0.size + fa1.size, fa0.start, "")
+    fa.add_transition(fa0.size + fa1.size, fa1.start + fa0.size, "")
 
     #define ends
     for id in fa0.end:
         fa.define_end(id)
     for id in fa1.end:
-        fa.define_end(id + len(fa0.nodes))
+        fa.define_end(id + fa0.size)
     
     return fa
 
 
 
 def augment_accepter(fa0: FiniteAutomaton) -> FiniteAutomaton:
-    # create new empty fa
-    fa = FiniteAutomaton()
-
-    # add all nodes to fa
-    for i in range(len(fa0.nodes)):
-        fa.add_node()
-    
-    # add all old transitions to fa
-    for n in fa0.nodes:
-        for c, id in n.transitions:
-            fa.add_transition(n.id, id, c)
+    # copy the automaton
+    fa = splice(fa0)
     
     # define the same start
     fa.define_start(fa0.start)
@@ -182,17 +225,8 @@ def augment_accepter(fa0: FiniteAutomaton) -> FiniteAutomaton:
 
 
 def question_accepter(fa0: FiniteAutomaton) -> FiniteAutomaton:
-    # create new empty fa
-    fa = FiniteAutomaton()
-
-    # add all nodes to fa
-    for i in range(len(fa0.nodes)):
-        fa.add_node()
-    
-    # add all old transitions to fa
-    for n in fa0.nodes:
-        for c, id in n.transitions:
-            fa.add_transition(n.id, id, c)
+    # copy the automaton
+    fa = splice(fa0)
     
     # define the same start
     fa.define_start(fa0.start)
@@ -207,17 +241,8 @@ def question_accepter(fa0: FiniteAutomaton) -> FiniteAutomaton:
 
 
 def plus_accepter(fa0: FiniteAutomaton) -> FiniteAutomaton:
-    # create new empty fa
-    fa = FiniteAutomaton()
-
-    # add all nodes to fa
-    for i in range(len(fa0.nodes)):
-        fa.add_node()
-    
-    # add all old transitions to fa
-    for n in fa0.nodes:
-        for c, id in n.transitions:
-            fa.add_transition(n.id, id, c)
+    # copy the automaton
+    fa = splice(fa0)
     
     # define the same start
     fa.define_start(fa0.start)
@@ -231,60 +256,173 @@ def plus_accepter(fa0: FiniteAutomaton) -> FiniteAutomaton:
 
 
 
-def __fa2dfarec(fa: FiniteAutomaton, alphabet: str, states: dict[int, set[int]], transitions: list[list[int]], accept: list[int], lookat: int) -> None:
+# sets, if given, receives the set of nfa states behind every dfa state
+def subset_construction(fa: FiniteAutomaton, alphabet: str, sets: list[frozenset[int]] | None = None) -> tuple[list[list[int]], list[int]]:
 
-    state = states[lookat]
+    # every set of nfa states becomes one dfa state, the dict interns them to their ids
+    start: frozenset[int] = frozenset(fa.closure(fa.start))
+    ids: dict[frozenset[int], int] = {start: 0}
+    states: list[frozenset[int]] = [start]
 
-    if fa.accepts(state):
-        accept.append(lookat)
+    transitions: list[list[int]] = []
+    accept: list[int] = []
+    end: set[int] = set(fa.end)
+    classes: list[int] = fa.char_classes(alphabet)
+
+    lookat: int = 0
+    while lookat < len(states):
+
+        state = states[lookat]
+
+        if not end.isdisjoint(state):
+            accept.append(lookat)
+
+        row: list[int] = []
+        targets: dict[int, int] = {}
+        for i, c in enumerate(alphabet):
+
+            # characters of the same class share their next state
+            if classes[i] in targets:
+                row.append(targets[classes[i]])
+                continue
+
+            # calculate next state, new ones are looked at later
+            next_state = frozenset(fa.next_state(state, c))
+            key = ids.get(next_state)
+            if key is None:
+                key = len(states)
+                ids[next_state] = key
+                states.append(next_state)
+            targets[classes[i]] = key
+            row.append(key)
+
+        transitions.append(row)
+        lookat += 1
+
+    if sets is not None:
+        sets.extend(states)
+    return transitions, accept
 
-    for c in alphabet:
+def dead_states(transitions: list[list[int]], accept: list[int]) -> list[int]:
 
-        # calculate next state
-        next_state = fa.next_state(state, c)
-        # next state already exists
-        if next_state in states.values():
-            key = list(states.values()).index(next_state)
-            assert states[key] == next_state
-            transitions[lookat][alphabet.index(c)] = key
-            continue
+    # walk the edges backwards from the accepting states, everything not reached can never accept
+    reverse: list[list[int]] = [[] for x in transitions]
+    for source, row in enumerate(transitions):
+        for target in row:
+            reverse[target].append(source)
+
+    alive: list[bool] = [False for x in transitions]
+    worklist: list[int] = list(accept)
+    for state in accept:
+        alive[state] = True
+
+    while worklist:
+        state = worklist.pop()
+        for source in reverse[state]:
+            if not alive[source]:
+                alive[source] = True
+                worklist.append(source)
 
-        # add new state to the list
-        new_id = len(states)
-        states[new_id] = next_state
-        transitions.append([-1 for x in alphabet])
-        transitions[lookat][alphabet.index(c)] = new_id
+    return [state for state in range(len(transitions)) if not alive[state]]
 
-        # recursive
-        __fa2dfarec(fa, alphabet, states, transitions, accept, new_id)
 
-def __reaches_accept(transitions: list[list[int]], visited: list[int], accepts: list[int], lookat: int) -> bool:
-    
-    visited.append(lookat)
 
-    if lookat in accepts: return True
+# labels, if given, keep differently labelled states apart and are renumbered in place
+def minimize(transitions: list[list[int]], accept: list[int], labels: list[int] | None = None) -> tuple[list[list[int]], list[int]]:
 
-    for t in transitions[lookat]:
-        if t in visited: continue
-        if __reaches_accept(transitions, visited, accepts, t): return True
-    
-    return False
+    if len(transitions) == 0: return transitions, accept
+    width: int = len(transitions[0])
 
+    # inverse[c][t] lists the states reaching t on column c
+    inverse: list[list[list[int]]] = [[[] for x in transitions] for c in range(width)]
+    for source, row in enumerate(transitions):
+        for c, target in enumerate(row):
+            inverse[c][target].append(source)
 
+    # start with accepting and non accepting states (or one block per label), a block only ever shrinks
+    if labels is None:
+        accepting: set[int] = set(accept)
+        initial: list[int] = [1 if state in accepting else 0 for state in range(len(transitions))]
+    else:
+        initial = labels
+    groups: dict[int, set[int]] = {}
+    for state, label in enumerate(initial):
+        groups.setdefault(label, set()).add(state)
+    blocks: list[set[int]] = list(groups.values())
+    block_of: list[int] = [0 for x in transitions]
+    for i, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = i
 
-def fa2dfa(fa: FiniteAutomaton, alphabet: str):
+    # Hopcroft, all initial blocks but the largest and later only the smaller half of a split block are splitters
+    waiting: set[int] = set(range(len(blocks)))
+    waiting.remove(max(range(len(blocks)), key=lambda i: len(blocks[i])))
+    while waiting:
+        splitter: set[int] = set(blocks[waiting.pop()])
 
-    states: dict[int, set[int]] = {}
-    transitions: list[list[int]] = [[-1 for x in alphabet]]
-    states[0] = fa.closure(fa.start)
-    accept: list[int] = []
+        for c in range(width):
 
-    __fa2dfarec(fa, alphabet, states, transitions, accept, 0)
-    
-    reject: list[int] = []
+            # states reaching the splitter on c, grouped by their block
+            touched: dict[int, set[int]] = {}
+            for target in splitter:
+                for source in inverse[c][target]:
+                    touched.setdefault(block_of[source], set()).add(source)
+
+            for i, inside in touched.items():
+                if len(inside) == len(blocks[i]): continue
+
+                outside: set[int] = blocks[i] - inside
+                smaller, larger = (inside, outside) if len(inside) <= len(outside) else (outside, inside)
+
+                # the larger half keeps the block id
+                blocks[i] = larger
+                new_id: int = len(blocks)
+                blocks.append(smaller)
+                for state in smaller:
+                    block_of[state] = new_id
+
+                # if i was waiting it still is, otherwise the smaller half suffices
+                waiting.add(new_id)
+
+    # renumber the blocks so that the start state stays 0
+    order: list[int] = sorted(range(len(blocks)), key=lambda i: min(blocks[i]))
+    number: list[int] = [0 for x in blocks]
+    for new_id, i in enumerate(order):
+        number[i] = new_id
+
+    minimal: list[list[int]] = [[number[block_of[t]] for t in transitions[min(blocks[i])]] for i in order]
+    minimal_accept: list[int] = sorted(set(number[block_of[state]] for state in accept))
+    if labels is not None:
+        labels[:] = [labels[min(blocks[i])] for i in order]
+
+    return minimal, minimal_accept
 
-    for start in range(len(states)):
-        if not __reaches_accept(transitions, [], accept, start): reject.append(start)
 
-    return transitions, accept, reject
 
+def alphabet_classes(transitions: list[list[int]]) -> tuple[list[int], list[list[int]]]:
+
+    if len(transitions) == 0: return [], transitions
+
+    # columns that are equal in every state are merged into one class
+    columns: dict[tuple[int, ...], int] = {}
+    classes: list[int] = []
+    representatives: list[int] = []
+    for c in range(len(transitions[0])):
+        column: tuple[int, ...] = tuple(row[c] for row in transitions)
+        if not column in columns:
+            columns[column] = len(columns)
+            representatives.append(c)
+        classes.append(columns[column])
+
+    return classes, [[row[c] for c in representatives] for row in transitions]
+
+
+
+def fa2dfa(fa: FiniteAutomaton, alphabet: str, minimal: bool = True):
+
+    transitions, accept = subset_construction(fa, alphabet)
+    if minimal:
+        transitions, accept = minimize(transitions, accept)
+    reject: list[int] = dead_states(transitions, accept)
+
+    return transitions, accept, reject
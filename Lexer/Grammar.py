@@ -1,82 +1,92 @@
 from typing import Self
 from typing import Callable
-import copy
+from typing import ClassVar
+from typing import Iterator
+
+# every distinct symbol is numbered once per process, symbols compare and hash by that number
+__symbol_ids: dict[str, int] = {}
+
+def symbol_id(kind: str, value: str) -> int:
+    key: str = kind + value
+    result: int | None = __symbol_ids.get(key)
+    if result is None:
+        result = __symbol_ids[key] = len(__symbol_ids)
+    return result
 
 # Base Symbol used in Grammars
 class Symbol:
+    __slots__ = ("value", "id")
+
+    kind: ClassVar[str] = "S"
     value: str
+    id: int
+
     def __init__(self, value: str) -> None:
         self.value = value
-    def __eq__(self, other: Self) -> bool:
+        self.id = symbol_id(self.kind, value)
+    def __eq__(self, other: object) -> bool:
         if not isinstance(other, Symbol): return False
-        return self.value == other.value
+        return self.id == other.id
+    def __hash__(self) -> int:
+        return self.id
     def __str__(self) -> str:
         return self.value
 
+    # ids are only valid in the process that assigned them, copies look them up again
+    def __getstate__(self) -> tuple[str, dict | None]:
+        return (self.value, getattr(self, "__dict__", None))
+    def __setstate__(self, state: tuple[str, dict | None]) -> None:
+        value, attributes = state
+        Symbol.__init__(self, value)
+        if attributes: self.__dict__.update(attributes)
+
 class Terminal(Symbol):
-    def __init__(self, value: str) -> None:
-        super().__init__(value)
-    def __eq__(self, other: Self) -> bool:
-        if not isinstance(other, Terminal): return False
-        return self.value == other.value
-    def __hash__(self) -> int:
-        return hash("T_" + str(self))
+    __slots__ = ()
+    kind: ClassVar[str] = "T"
 
 class Empty(Terminal):
+    __slots__ = ()
     def __init__(self) -> None:
         super().__init__("")
 
 class NonTerminal(Symbol):
-    def __init__(self, value: str) -> None:
-        super().__init__(value)
-    def __eq__(self, other: Self) -> bool:
-        if not isinstance(other, NonTerminal): return False
-        return self.value == other.value
-    def __hash__(self) -> int:
-        return hash("N_" + str(self))
+    __slots__ = ()
+    kind: ClassVar[str] = "N"
+
+# shared instance, symbols are never changed after construction
+EMPTY: Empty = Empty()
 
 class String:
+    __slots__ = ("symbols",)
 
-    symbols : list[Symbol]
+    symbols : tuple[Symbol, ...]
 
-    __iter : int
+    def __init__(self, symbols : list[Symbol] | tuple[Symbol, ...]) -> None:
+        self.symbols = tuple(symbols)
 
-    def __init__(self, symbols : list[Symbol]) -> None:
-        self.symbols = symbols
-    
     def __getitem__(self, key:int) -> Symbol:
-        if key < 0 or key >= len(self.symbols): return Empty()
+        if key < 0 or key >= len(self.symbols): return EMPTY
         return self.symbols[key]
-    
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
     def patched(self) -> Self:
-        return String([copy.deepcopy(x) for x in self.symbols if x != Empty()])
+        if not EMPTY in self.symbols: return self
+        return String(tuple(x for x in self.symbols if x != EMPTY))
 
-    def __eq__(self, other: Self) -> bool:
+    def __eq__(self, other: object) -> bool:
         if not isinstance(other, String): return False
-        x : String = self.patched()
-        y : String = other.patched()
-        for i in range(max(len(x.symbols), len(y.symbols))):
-            if x[i] != y[i]: return False
-        return True
-    
-    def __str__(self) -> str:
-        result: str = ""
-        for symbol in self:
-            result += str(symbol)
-        return result
+        return self.patched().symbols == other.patched().symbols
 
-    def __iter__(self) -> Self:
-        x: Self = copy.deepcopy(self)
-        x.__iter = 0
-        return x
+    def __hash__(self) -> int:
+        return hash(self.patched().symbols)
 
-    def __next__(self) -> Symbol:
-        if self.__iter >= len(self.symbols): raise StopIteration
-        x : Symbol = self[self.__iter]
-        self.__iter += 1
-        return x
+    def __str__(self) -> str:
+        return "".join(symbol.value for symbol in self.symbols)
 
-    
+    def __iter__(self) -> Iterator[Symbol]:
+        return iter(self.symbols)
 
 # type Rule = tuple[NonTerminal, String]
 class Rule:
@@ -109,7 +119,7 @@ def str2rule(v: str, application: Callable[[String],NonTerminal] | None = None)
     rhs: list[Symbol] = []
 
     if len(v) == 3:
-        rhs.append(Empty())
+        rhs.append(EMPTY)
     
     for s in v[3:]:
         if s.isupper():
@@ -121,12 +131,18 @@ def str2rule(v: str, application: Callable[[String],NonTerminal] | None = None)
 
 class Grammar:
 
-    terminals : list[Terminal]
-    nonterminals : list[NonTerminal]
+    terminals : list[Terminal] | tuple[Terminal, ...]
+    nonterminals : list[NonTerminal] | tuple[NonTerminal, ...]
     start : NonTerminal
-    rules : list[Rule]
+    rules : list[Rule] | tuple[Rule, ...]
 
-    __first : dict[Symbol, list[Terminal]] = {}
+    # FIRST and FOLLOW sets are bitsets over the terminal indices, nullable is a bitset over the nonterminal indices
+    __terminal_index : dict[Terminal, int]
+    __nonterminal_index : dict[NonTerminal, int]
+    __first : list[int]
+    __follow : list[int]
+    __nullable : int
+    __first_lists : dict[Symbol, list[Terminal]]
 
     def __init__(self, terminals: list[Terminal], nonterminals: list[NonTerminal], start: NonTerminal, rules : list[Rule]) -> None:
         self.terminals = terminals
@@ -134,63 +150,150 @@ class Grammar:
         self.start = start
         self.rules = rules
 
-        if not Empty() in self.terminals:
-            self.terminals.append(Empty())
+        if not EMPTY in self.terminals:
+            self.terminals.append(EMPTY)
 
-        self.__init_first()
-    
-    def __init_first(self) -> None:
-        
-        # initalize terminals
-        for symbol in self.terminals:
-            self.__first[symbol] = [symbol]
-        
-        # initalize nonterminals
-        for symbol in self.nonterminals:
-            self.__first[symbol] = []
-        
-        repeat: bool = True
-        while repeat:
-            repeat = False
-            for rule in self.rules:
-                lhs, rhs = rule.lhs, rule.rhs
-                counter: int = 0
-                for symbol in rhs:
+        self.__terminal_index = {t: i for i, t in enumerate(self.terminals)}
+        self.__nonterminal_index = {n: i for i, n in enumerate(self.nonterminals)}
 
-                    result: set[Terminal] = set(self.__first[symbol])
+        encoded: list[tuple[int, list[int]]] = self.__encoded_rules()
+        self.__init_nullable(encoded)
+        self.__init_first(encoded)
+        self.__init_follow(encoded)
 
-                    if not result.issubset(self.__first[lhs]):
-                        self.__first[lhs] = list(set.union(set(self.__first[lhs]), result)) # compute union
-                        repeat = True
+        self.__first_lists = {}
+        for symbol in self.terminals:
+            self.__first_lists[symbol] = self.terminals_of(self.first_bits(symbol), self.nullable(symbol))
+        for symbol in self.nonterminals:
+            self.__first_lists[symbol] = self.terminals_of(self.first_bits(symbol), self.nullable(symbol))
+
+    # grammars that are shared between users must not be changed afterwards
+    def freeze(self) -> None:
+        self.terminals = tuple(self.terminals)
+        self.nonterminals = tuple(self.nonterminals)
+        self.rules = tuple(self.rules)
+
+    # right hand sides as nonterminal indices (>= 0) and terminal bits (< 0, stored as ~bit), the empty word is dropped
+    def __encoded_rules(self) -> list[tuple[int, list[int]]]:
+        encoded: list[tuple[int, list[int]]] = []
+        for rule in self.rules:
+            rhs: list[int] = []
+            for symbol in rule.rhs.symbols:
+                if symbol == EMPTY: continue
+                if isinstance(symbol, NonTerminal):
+                    rhs.append(self.__nonterminal_index[symbol])
+                else:
+                    rhs.append(~(1 << self.__terminal_index[symbol]))
+            encoded.append((self.__nonterminal_index[rule.lhs], rhs))
+        return encoded
+
+    def __init_nullable(self, encoded: list[tuple[int, list[int]]]) -> None:
+        # every rule counts the symbols of its right hand side not yet known to be nullable
+        remaining: list[int] = []
+        users: list[list[int]] = [[] for _ in self.nonterminals]
+        worklist: list[int] = []
+        self.__nullable = 0
+
+        for r, (lhs, rhs) in enumerate(encoded):
+            remaining.append(len(rhs))
+            for x in rhs:
+                if x >= 0: users[x].append(r)
+            if not rhs: worklist.append(lhs)
+
+        while worklist:
+            n: int = worklist.pop()
+            if self.__nullable >> n & 1: continue
+            self.__nullable |= 1 << n
+            for r in users[n]:
+                remaining[r] -= 1
+                if remaining[r] == 0:
+                    worklist.append(encoded[r][0])
+
+    def __init_first(self, encoded: list[tuple[int, list[int]]]) -> None:
+        # first[lhs] contains first[x] for every x reachable over a nullable prefix
+        self.__first = [0] * len(self.nonterminals)
+        users: list[list[int]] = [[] for _ in self.nonterminals]
+        for lhs, rhs in encoded:
+            for x in rhs:
+                if x < 0:
+                    self.__first[lhs] |= ~x
+                    break
+                users[x].append(lhs)
+                if not self.__nullable >> x & 1: break
+
+        worklist: list[int] = [n for n in range(len(self.nonterminals)) if self.__first[n]]
+        while worklist:
+            n: int = worklist.pop()
+            for m in users[n]:
+                if self.__first[n] & ~self.__first[m]:
+                    self.__first[m] |= self.__first[n]
+                    worklist.append(m)
+
+    def __init_follow(self, encoded: list[tuple[int, list[int]]]) -> None:
+        # follow[x] contains follow[lhs] whenever x is followed by a nullable suffix
+        # the start symbol is followed by the end of the input, which is the empty word
+        self.__follow = [0] * len(self.nonterminals)
+        if self.start in self.__nonterminal_index:
+            self.__follow[self.__nonterminal_index[self.start]] = 1 << self.__terminal_index[EMPTY]
+        users: list[list[int]] = [[] for _ in self.nonterminals]
+        for lhs, rhs in encoded:
+            suffix: int = 0
+            nullable: bool = True
+            for x in reversed(rhs):
+                if x < 0:
+                    suffix, nullable = ~x, False
+                    continue
+                self.__follow[x] |= suffix
+                if nullable: users[lhs].append(x)
+                if self.__nullable >> x & 1:
+                    suffix |= self.__first[x]
+                else:
+                    suffix, nullable = self.__first[x], False
+
+        worklist: list[int] = [n for n in range(len(self.nonterminals)) if self.__follow[n]]
+        while worklist:
+            n: int = worklist.pop()
+            for m in users[n]:
+                if self.__follow[n] & ~self.__follow[m]:
+                    self.__follow[m] |= self.__follow[n]
+                    worklist.append(m)
+
+    def terminals_of(self, bits: int, empty: bool = False) -> list[Terminal]:
+        result: list[Terminal] = [t for i, t in enumerate(self.terminals) if bits >> i & 1]
+        if empty: result.append(EMPTY)
+        return result
 
-                    if not Empty() in result:
-                        break
+    def nullable(self, string: String | Symbol) -> bool:
+        if isinstance(string, Symbol):
+            if isinstance(string, NonTerminal):
+                return bool(self.__nullable >> self.__nonterminal_index[string] & 1)
+            return string == EMPTY
+        return all(self.nullable(symbol) for symbol in string.symbols)
 
-                    # if we reach this point the string may derive the empty word
-                    if counter < len(rhs.symbols) - 1:
-                        self.__first[lhs].remove(Empty())
-                    counter += 1
+    def first_bits(self, string: String | Symbol) -> int:
+        if isinstance(string, Symbol):
+            if isinstance(string, NonTerminal):
+                return self.__first[self.__nonterminal_index[string]]
+            if string == EMPTY: return 0
+            return 1 << self.__terminal_index[string]
+
+        bits: int = 0
+        for symbol in string.symbols:
+            bits |= self.first_bits(symbol)
+            # symbol can derive the empty word, we also need to consider the next one
+            if not self.nullable(symbol): break
+        return bits
 
-    
     def first(self, string: String | Symbol) -> list[Terminal]:
-
         if isinstance(string, Symbol):
-            return self.__first[string]
-        
-        elif isinstance(string, String):
-
-            accumulated: list[NonTerminal] = []
-
-            for symbol in string:
+            return self.__first_lists[string]
+        return self.terminals_of(self.first_bits(string), self.nullable(string))
 
-                result: list[Terminal] = self.first(symbol)
-                accumulated += result
-
-                # symbol can derive empty word, we also need to consider next token
-                if Empty() in result:
-                    continue
+    def follow_bits(self, symbol: NonTerminal) -> int:
+        return self.__follow[self.__nonterminal_index[symbol]]
 
-            return list(set(accumulated))
+    def follow(self, symbol: NonTerminal) -> list[Terminal]:
+        return self.terminals_of(self.follow_bits(symbol))
 
 def rules2grammar(rules: list[Rule], start: NonTerminal) -> Grammar:
 
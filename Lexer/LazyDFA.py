@@ -0,0 +1,89 @@
+import FiniteAutomaton as FA
+
+# a flush that happens before this many characters per cached state were read counts as thrashing
+THRASH_FACTOR: int = 10
+# number of thrashing flushes after which a run falls back to nfa simulation
+THRASH_LIMIT: int = 3
+
+class LazyDFA:
+
+    fa: FA.FiniteAutomaton
+
+    # dfa states built so far, the cost of a state is its number of nfa states plus its cached transitions.
+    # budget and cost count those entries, not bytes
+    budget: int
+    cost: int
+    ids: dict[frozenset[int], int]
+    sets: list[frozenset[int]]
+    transitions: list[dict[str, int]]
+    accepting: list[bool]
+
+    flushes: int
+
+    def __init__(self, fa: FA.FiniteAutomaton, budget: int = 1 << 16) -> None:
+        self.fa = fa
+        self.budget = budget
+        self.flushes = 0
+        self.flush()
+
+    def flush(self) -> None:
+        self.cost = 0
+        self.ids = {}
+        self.sets = []
+        self.transitions = []
+        self.accepting = []
+
+    def state(self, nfa_states: frozenset[int]) -> int:
+        key = self.ids.get(nfa_states)
+        if key is None:
+            key = len(self.sets)
+            self.ids[nfa_states] = key
+            self.sets.append(nfa_states)
+            self.transitions.append({})
+            self.accepting.append(self.fa.accepts(nfa_states))
+            self.cost += len(nfa_states) + 1
+        return key
+
+    def run(self, word: str) -> bool:
+
+        state: int = self.state(frozenset(self.fa.closure(self.fa.start)))
+        read: int = 0
+        thrashing: int = 0
+
+        for i, c in enumerate(word):
+
+            target = self.transitions[state].get(c)
+            if target is None:
+                nfa_states: frozenset[int] = frozenset(self.fa.next_state(self.sets[state], c))
+
+                # out of memory, start over with an empty cache
+                if self.cost >= self.budget:
+                    if read < THRASH_FACTOR * len(self.sets):
+                        thrashing += 1
+                    self.flushes += 1
+                    self.flush()
+                    read = 0
+
+                    # the cache does not help this input, simulate the nfa for the rest of it
+                    if thrashing >= THRASH_LIMIT:
+                        return self.simulate(nfa_states, word[i + 1:])
+
+                    # the current state is gone with the cache, so this transition is not remembered
+                    target = self.state(nfa_states)
+                else:
+                    target = self.state(nfa_states)
+                    self.transitions[state][c] = target
+                    self.cost += 1
+
+            state = target
+            read += 1
+            if not self.sets[state]: return False
+
+        return self.accepting[state]
+
+    def simulate(self, nfa_states: frozenset[int] | set[int], word: str) -> bool:
+        current: set[int] = set(nfa_states)
+        for c in word:
+            if not current: return False
+            current = self.fa.next_state(current, c)
+        return self.fa.accepts(current)
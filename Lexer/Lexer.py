@@ -0,0 +1,152 @@
+from typing import BinaryIO, Iterator, TextIO
+import codecs
+import mmap
+import FiniteAutomaton as FA
+import RegexToFA as R2FA
+
+class LexerException(Exception):
+    pass
+
+# no token accepted in a state
+UNTAGGED: int = -1
+
+class Lexer:
+
+    # token names by priority, earlier tokens win matches of the same length
+    names: list[str]
+    alphabet: str
+
+    # minimal union dfa over character classes, tags[state] is the token accepted in state
+    transitions: list[list[int]]
+    tags: list[int]
+    dead: list[bool]
+    lookup: dict[str, int]
+
+    def __init__(self, tokens: list[tuple[str, str, str]]) -> None:
+
+        self.names = [name for name, regex, alphabet in tokens]
+        self.alphabet = "".join(dict.fromkeys("".join(alphabet for name, regex, alphabet in tokens)))
+
+        # union of all token automata behind a new start state
+        parts: list[FA.FiniteAutomaton] = [R2FA.regex2FA(regex, alphabet) for name, regex, alphabet in tokens]
+        fa: FA.FiniteAutomaton = FA.splice(*parts)
+        fa.add_node()
+        fa.define_start(fa.size - 1)
+
+        owner: dict[int, int] = {}
+        offset: int = 0
+        for token, part in enumerate(parts):
+            fa.add_transition(fa.start, part.start + offset, "")
+            for id in part.end:
+                fa.define_end(id + offset)
+                owner.setdefault(id + offset, token)
+            offset += part.size
+
+        # a dfa state accepts the token with the highest priority among its nfa states
+        sets: list[frozenset[int]] = []
+        transitions, accept = FA.subset_construction(fa, self.alphabet, sets)
+        tags: list[int] = [min([owner[x] for x in state if x in owner], default=UNTAGGED) for state in sets]
+
+        transitions, accept = FA.minimize(transitions, accept, tags)
+        reject: list[int] = FA.dead_states(transitions, accept)
+        classes, self.transitions = FA.alphabet_classes(transitions)
+
+        self.tags = tags
+        self.dead = [False for x in self.transitions]
+        for state in reject:
+            self.dead[state] = True
+        self.lookup = {}
+        for c, i in zip(self.alphabet, classes):
+            self.lookup.setdefault(c, i)
+
+    # longest match from position, returns (token, end) or (UNTAGGED, position)
+    def match(self, text: str, position: int) -> tuple[int, int]:
+
+        state: int = 0
+        token: int = UNTAGGED
+        end: int = position
+
+        i: int = position
+        while i < len(text):
+            c: int = self.lookup.get(text[i], -1)
+            if c == -1: break
+            state = self.transitions[state][c]
+            if self.dead[state]: break
+            i += 1
+            if self.tags[state] != UNTAGGED:
+                token = self.tags[state]
+                end = i
+
+        return token, end
+
+    def tokenize(self, text: str) -> Iterator[tuple[str, int, int]]:
+
+        position: int = 0
+        while position < len(text):
+            token, end = self.match(text, position)
+            if token == UNTAGGED or end == position:
+                raise LexerException("no token matches at position " + str(position))
+            yield self.names[token], position, end
+            position = end
+
+    # positions are character offsets into the decoded input, memory stays within one chunk plus the pending token
+    def tokenize_stream(self, source: TextIO | BinaryIO | mmap.mmap, chunk: int = 1 << 16, encoding: str = "utf-8") -> Iterator[tuple[str, int, int]]:
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        finished: bool = False
+
+        # buffer[start:] is not consumed yet, buffer[0] is at offset base of the input
+        buffer: str = ""
+        base: int = 0
+        start: int = 0
+
+        # scanner of the pending token, carried over chunk boundaries
+        state: int = 0
+        token: int = UNTAGGED
+        end: int = 0
+        i: int = 0
+
+        while True:
+
+            stopped: bool = False
+            while i < len(buffer):
+                c: int = self.lookup.get(buffer[i], -1)
+                if c == -1:
+                    stopped = True
+                    break
+                state = self.transitions[state][c]
+                if self.dead[state]:
+                    stopped = True
+                    break
+                i += 1
+                if self.tags[state] != UNTAGGED:
+                    token = self.tags[state]
+                    end = i
+
+            # the pending token may continue in the next chunk
+            if not stopped and not finished:
+                data: str | bytes = source.read(chunk)
+                finished = len(data) == 0
+                if isinstance(data, str):
+                    text: str = data
+                else:
+                    text = decoder.decode(data, final=finished)
+
+                buffer = buffer[start:] + text
+                base += start
+                i -= start
+                end -= start
+                start = 0
+                continue
+
+            if start == len(buffer):
+                return
+
+            if token == UNTAGGED or end == start:
+                raise LexerException("no token matches at position " + str(base + start))
+            yield self.names[token], base + start, base + end
+
+            start = end
+            state = 0
+            token = UNTAGGED
+            i = end
@@ -0,0 +1,477 @@
+import Grammar as G
+from typing import Any, Callable, Iterable
+
+# action table entries: shifts are stored as the target state, reductions as -3 - rule index
+ERROR: int = -1
+ACCEPT: int = -2
+
+def reduction(rule: int) -> int:
+    return -3 - rule
+
+def reduced_rule(action: int) -> int:
+    return -3 - action
+
+# two actions wanted the same table entry, kept is the one that went into the table
+class Conflict:
+    state: int
+    terminal: str
+    kept: int
+    dropped: int
+
+    def __init__(self, state: int, terminal: str, kept: int, dropped: int) -> None:
+        self.state = state
+        self.terminal = terminal
+        self.kept = kept
+        self.dropped = dropped
+
+    def kind(self) -> str:
+        return ("shift" if self.kept >= ACCEPT else "reduce") + "/reduce"
+
+    def __str__(self) -> str:
+        def describe(action: int) -> str:
+            if action == ACCEPT: return "accept"
+            if action >= 0: return "shift " + str(action)
+            return "reduce " + str(reduced_rule(action))
+        return self.kind() + " conflict in state " + str(self.state) + " on '" + self.terminal + "': " + describe(self.kept) + " over " + describe(self.dropped)
+
+class ParseTable:
+    terminals: dict[str, int]
+    nonterminals: dict[str, int]
+    rules: list[G.Rule] | tuple[G.Rule, ...]
+
+    action: list[list[int]]
+    goto: list[list[int]]
+
+    conflicts: list[Conflict]
+
+    # per rule, the number of symbols a reduction pops and the goto column of its left hand side
+    lengths: list[int]
+    lhs: list[int]
+
+    def __init__(self, terminals: list[str], nonterminals: list[str], rules: list[G.Rule] | tuple[G.Rule, ...], action: list[list[int]], goto: list[list[int]]) -> None:
+        self.terminals = {t: i for i, t in enumerate(terminals)}
+        self.nonterminals = {n: i for i, n in enumerate(nonterminals)}
+        self.rules = rules
+        self.action = action
+        self.goto = goto
+        self.conflicts = []
+        self.lengths = [len([x for x in rule.rhs.symbols if x != G.EMPTY]) for rule in rules]
+        self.lhs = [self.nonterminals.get(rule.lhs.value, ERROR) for rule in rules]
+
+    def transition(self, state: int, symbol: G.Symbol) -> int:
+        if isinstance(symbol, G.Terminal):
+            if not symbol.value in self.terminals: return ERROR
+            return self.action[state][self.terminals[symbol.value]]
+        if not symbol.value in self.nonterminals: return ERROR
+        return self.goto[state][self.nonterminals[symbol.value]]
+
+    # shifting and accepting win over reducing and earlier rules win over later ones
+    def add_reduction(self, state: int, terminal: int, rule: int) -> None:
+        row: list[int] = self.action[state]
+        current: int = row[terminal]
+        action: int = reduction(rule)
+        if current == ERROR:
+            row[terminal] = action
+            return
+        if current == action: return
+
+        kept: int = current if current >= ACCEPT else max(current, action)
+        row[terminal] = kept
+        self.conflicts.append(Conflict(state, list(self.terminals)[terminal], kept, action if kept == current else current))
+
+# LR(1) items of a grammar packed into single integers, ((rule << dot bits) | dot) << lookahead bits | lookahead
+# the part without the lookahead is the core of the item, symbols are numbered with the terminals first
+class Items:
+    terminal_count: int
+    lhs: list[int]
+    rhs: list[tuple[int, ...]]
+    by_lhs: list[list[int]]
+
+    dot_bits: int
+    lookahead_bits: int
+
+    # indexed by core: the symbol after the dot (-1 for final items), the terminals starting the rest
+    # behind that symbol as bits and as a list, and whether that rest can derive the empty word
+    after: list[int]
+    rest_first: list[int]
+    rest_terminals: list[list[int]]
+    rest_nullable: list[bool]
+
+    __closures: dict[frozenset[int], tuple[int, ...]]
+
+    def __init__(self, grammar: G.Grammar) -> None:
+        terminals: dict[G.Symbol, int] = {t: i for i, t in enumerate(grammar.terminals)}
+        nonterminals: dict[G.Symbol, int] = {n: i for i, n in enumerate(grammar.nonterminals)}
+        self.terminal_count = len(terminals)
+
+        self.lhs = []
+        self.rhs = []
+        self.by_lhs = [[] for n in nonterminals]
+        for r, rule in enumerate(grammar.rules):
+            self.lhs.append(nonterminals[rule.lhs])
+            self.rhs.append(tuple(terminals[x] if isinstance(x, G.Terminal) else self.terminal_count + nonterminals[x] for x in rule.rhs.symbols if x != G.EMPTY))
+            self.by_lhs[nonterminals[rule.lhs]].append(r)
+
+        self.dot_bits = max(len(x) for x in self.rhs).bit_length() + 1
+        # one spare lookahead above the terminals, used as a marker while propagating LALR lookaheads
+        self.lookahead_bits = self.terminal_count.bit_length()
+
+        cores: int = len(self.rhs) << self.dot_bits
+        self.after = [-1] * cores
+        self.rest_first = [0] * cores
+        self.rest_terminals = [[] for x in range(cores)]
+        self.rest_nullable = [True] * cores
+        for r, rule in enumerate(grammar.rules):
+            symbols: list[G.Symbol] = [x for x in rule.rhs.symbols if x != G.EMPTY]
+            first: int = 0
+            nullable: bool = True
+            for dot in range(len(symbols) - 1, -1, -1):
+                core: int = r << self.dot_bits | dot
+                self.after[core] = self.rhs[r][dot]
+                self.rest_first[core] = first
+                self.rest_terminals[core] = [t for t in range(self.terminal_count) if first >> t & 1]
+                self.rest_nullable[core] = nullable
+
+                if grammar.nullable(symbols[dot]):
+                    first |= grammar.first_bits(symbols[dot])
+                else:
+                    first, nullable = grammar.first_bits(symbols[dot]), False
+
+        self.__closures = {}
+
+    def pack(self, rule: int, dot: int, lookahead: int) -> int:
+        return ((rule << self.dot_bits) | dot) << self.lookahead_bits | lookahead
+
+    def rule(self, item: int) -> int:
+        return item >> self.lookahead_bits >> self.dot_bits
+
+    def dot(self, item: int) -> int:
+        return item >> self.lookahead_bits & ((1 << self.dot_bits) - 1)
+
+    def lookahead(self, item: int) -> int:
+        return item & ((1 << self.lookahead_bits) - 1)
+
+    def next_symbol(self, item: int) -> int:
+        return self.after[item >> self.lookahead_bits]
+
+    # every item set is completed once, identified by its kernel
+    def closure(self, kernel: frozenset[int]) -> tuple[int, ...]:
+        result: tuple[int, ...] | None = self.__closures.get(kernel)
+        if result is not None: return result
+
+        shift: int = self.lookahead_bits
+        mask: int = (1 << shift) - 1
+        after: list[int] = self.after
+
+        # a nonterminal is expanded once for every lookahead it is needed with
+        expanded: set[int] = set()
+        items: set[int] = set(kernel)
+        worklist: list[int] = list(kernel)
+        while worklist:
+            item: int = worklist.pop()
+            core: int = item >> shift
+            symbol: int = after[core] - self.terminal_count
+            if symbol < 0: continue
+
+            lookaheads: list[int] = self.rest_terminals[core]
+            if self.rest_nullable[core]:
+                lookaheads = lookaheads + [item & mask]
+
+            for t in lookaheads:
+                key: int = symbol << shift | t
+                if key in expanded: continue
+                expanded.add(key)
+                for r in self.by_lhs[symbol]:
+                    new_item: int = r << self.dot_bits << shift | t
+                    if not new_item in items:
+                        items.add(new_item)
+                        worklist.append(new_item)
+
+        result = self.__closures[kernel] = tuple(sorted(items))
+        return result
+
+    # LR(0) closure of a kernel of cores, every nonterminal is expanded once
+    def core_closure(self, kernel: frozenset[int]) -> list[int]:
+        cores: list[int] = list(kernel)
+        expanded: set[int] = set()
+        i: int = 0
+        while i < len(cores):
+            symbol: int = self.after[cores[i]] - self.terminal_count
+            i += 1
+            if symbol < 0 or symbol in expanded: continue
+            expanded.add(symbol)
+            for r in self.by_lhs[symbol]:
+                if not r << self.dot_bits in kernel:
+                    cores.append(r << self.dot_bits)
+        return cores
+
+    def core_transitions(self, kernel: frozenset[int]) -> dict[int, frozenset[int]]:
+        advanced: dict[int, list[int]] = {}
+        for core in self.core_closure(kernel):
+            symbol: int = self.after[core]
+            if symbol < 0: continue
+            if symbol in advanced:
+                advanced[symbol].append(core + 1)
+            else:
+                advanced[symbol] = [core + 1]
+        return {symbol: frozenset(cores) for symbol, cores in advanced.items()}
+
+    # closure of cores carrying lookahead bitsets, the bits grow until nothing changes
+    def lookahead_closure(self, kernel: dict[int, int]) -> dict[int, int]:
+        result: dict[int, int] = dict(kernel)
+        worklist: list[int] = list(kernel)
+        while worklist:
+            core: int = worklist.pop()
+            symbol: int = self.after[core] - self.terminal_count
+            if symbol < 0: continue
+
+            bits: int = self.rest_first[core]
+            if self.rest_nullable[core]:
+                bits |= result[core]
+
+            for r in self.by_lhs[symbol]:
+                new_core: int = r << self.dot_bits
+                if bits & ~result.get(new_core, 0):
+                    result[new_core] = result.get(new_core, 0) | bits
+                    worklist.append(new_core)
+        return result
+
+    # kernels reached by reading each symbol from the closure of kernel
+    def transitions(self, kernel: frozenset[int]) -> dict[int, frozenset[int]]:
+        shift: int = self.lookahead_bits
+        step: int = 1 << shift
+        after: list[int] = self.after
+
+        advanced: dict[int, list[int]] = {}
+        for item in self.closure(kernel):
+            symbol: int = after[item >> shift]
+            if symbol < 0: continue
+            if symbol in advanced:
+                advanced[symbol].append(item + step)
+            else:
+                advanced[symbol] = [item + step]
+        return {symbol: frozenset(items) for symbol, items in advanced.items()}
+
+class GrammarException(Exception):
+    pass
+
+# canonical LR(1) tables accept on reading the end marker of the grammar: the starting symbol needs exactly
+# one rule and it has to end in a terminal, like S -> E EOL. build_lalr_table has no such requirement
+def build_table(grammar: G.Grammar) -> ParseTable:
+
+    terminals: dict[str, int] = {t.value: i for i, t in enumerate(grammar.terminals)}
+    nonterminals: dict[str, int] = {n.value: i for i, n in enumerate(grammar.nonterminals)}
+    table: ParseTable = ParseTable(list(terminals), list(nonterminals), grammar.rules, [], [])
+
+    items: Items = Items(grammar)
+    start_rules: list[int] = [i for i, rule in enumerate(grammar.rules) if rule.lhs == grammar.start]
+    if len(start_rules) != 1 or not items.rhs[start_rules[0]] or items.rhs[start_rules[0]][-1] >= items.terminal_count:
+        raise GrammarException("the starting symbol " + str(grammar.start) + " needs a single rule ending in a terminal")
+    start_rule: int = start_rules[0]
+    accept: int = items.pack(start_rule, len(items.rhs[start_rule]) - 1, 0) >> items.lookahead_bits
+
+    # canonical LR(1) collection, kernels are interned so every item set is visited exactly once
+    # the starting item looks ahead at the empty word, which stands for the end of the input
+    kernels: list[frozenset[int]] = [frozenset([items.pack(start_rule, 0, terminals[""])])]
+    states: dict[frozenset[int], int] = {kernels[0]: 0}
+
+    lookat: int = 0
+    while lookat < len(kernels):
+        kernel: frozenset[int] = kernels[lookat]
+        action: list[int] = [ERROR for x in terminals]
+        goto: list[int] = [ERROR for x in nonterminals]
+        table.action.append(action)
+        table.goto.append(goto)
+
+        # shifts and gotos
+        for symbol, next_kernel in items.transitions(kernel).items():
+            state: int | None = states.get(next_kernel)
+            if state is None:
+                state = states[next_kernel] = len(kernels)
+                kernels.append(next_kernel)
+
+            if symbol < items.terminal_count:
+                action[symbol] = state
+            else:
+                goto[symbol - items.terminal_count] = state
+
+        # reading the last symbol of the starting rule accepts
+        for item in items.closure(kernel):
+            symbol: int = items.after[item >> items.lookahead_bits]
+            if symbol < 0:
+                table.add_reduction(lookat, items.lookahead(item), items.rule(item))
+            elif item >> items.lookahead_bits == accept:
+                action[symbol] = ACCEPT
+
+        lookat += 1
+
+    return table
+
+# the grammar with a new starting rule S' -> S appended, accepting happens when S is complete at the end of the input
+def augmented(grammar: G.Grammar) -> G.Grammar:
+    names: set[str] = set(n.value for n in grammar.nonterminals)
+    start: str = grammar.start.value + "'"
+    while start in names:
+        start += "'"
+    rule: G.Rule = G.Rule(G.NonTerminal(start), G.String([grammar.start]), lambda x: x[0])
+    return G.Grammar(list(grammar.terminals), list(grammar.nonterminals) + [rule.lhs], rule.lhs, list(grammar.rules) + [rule])
+
+# LALR(1) tables from the LR(0) collection, lookaheads are found by propagation
+# end of input is the empty word, the table keeps the rules of grammar and adds the starting rule at the end
+def build_lalr_table(grammar: G.Grammar) -> ParseTable:
+
+    grammar = augmented(grammar)
+    terminals: dict[str, int] = {t.value: i for i, t in enumerate(grammar.terminals)}
+    nonterminals: dict[str, int] = {n.value: i for i, n in enumerate(grammar.nonterminals)}
+    table: ParseTable = ParseTable(list(terminals), list(nonterminals), grammar.rules, [], [])
+
+    items: Items = Items(grammar)
+    start_rule: int = len(grammar.rules) - 1
+    end: int = 1 << terminals[""]
+    marker: int = 1 << items.terminal_count
+
+    # LR(0) collection
+    kernels: list[frozenset[int]] = [frozenset([start_rule << items.dot_bits])]
+    states: dict[frozenset[int], int] = {kernels[0]: 0}
+    transitions: list[dict[int, int]] = []
+
+    lookat: int = 0
+    while lookat < len(kernels):
+        successors: dict[int, int] = {}
+        for symbol, next_kernel in items.core_transitions(kernels[lookat]).items():
+            state: int | None = states.get(next_kernel)
+            if state is None:
+                state = states[next_kernel] = len(kernels)
+                kernels.append(next_kernel)
+            successors[symbol] = state
+        transitions.append(successors)
+        lookat += 1
+
+    # closing a kernel item under the marker lookahead shows which lookaheads the items it
+    # leads to get on their own and which they inherit from it
+    lookaheads: list[dict[int, int]] = [{core: 0 for core in kernel} for kernel in kernels]
+    propagates: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    lookaheads[0][start_rule << items.dot_bits] = end
+
+    for state, kernel in enumerate(kernels):
+        for core in kernel:
+            targets: list[tuple[int, int]] = []
+            for c, bits in items.lookahead_closure({core: marker}).items():
+                symbol: int = items.after[c]
+                if symbol < 0: continue
+                target: int = transitions[state][symbol]
+                lookaheads[target][c + 1] |= bits & ~marker
+                if bits & marker:
+                    targets.append((target, c + 1))
+            propagates[(state, core)] = targets
+
+    worklist: list[tuple[int, int]] = [(state, core) for state, kernel in enumerate(kernels) for core in kernel]
+    while worklist:
+        state, core = worklist.pop()
+        bits: int = lookaheads[state][core]
+        for target, c in propagates[(state, core)]:
+            if bits & ~lookaheads[target][c]:
+                lookaheads[target][c] |= bits
+                worklist.append((target, c))
+
+    for state, kernel in enumerate(kernels):
+        action: list[int] = [ERROR for x in terminals]
+        goto: list[int] = [ERROR for x in nonterminals]
+        table.action.append(action)
+        table.goto.append(goto)
+
+        for symbol, target in transitions[state].items():
+            if symbol < items.terminal_count:
+                action[symbol] = target
+            else:
+                goto[symbol - items.terminal_count] = target
+
+        # the completed starting rule accepts at the end of the input, before any reduction could claim it
+        closure: dict[int, int] = items.lookahead_closure(lookaheads[state])
+        if (start_rule << items.dot_bits | 1) in closure:
+            action[terminals[""]] = ACCEPT
+
+        for core, bits in closure.items():
+            rule: int = core >> items.dot_bits
+            if items.after[core] >= 0 or rule == start_rule: continue
+            for t in range(items.terminal_count):
+                if bits >> t & 1:
+                    table.add_reduction(state, t, rule)
+
+    return table
+
+class ParseException(Exception):
+    pass
+
+# lexer tokens are (name, start, end) tuples, grammar terminals are named by their value
+def token_name(token: Any) -> str:
+    if isinstance(token, G.Symbol): return token.value
+    return token[0]
+
+# tokens are named the way the table reads them and numbered from 0 in the stream
+def __describe(token: Any, index: int, name: Callable[[Any], str]) -> str:
+    return "token " + repr(name(token)) + " at " + str(index)
+
+# table driven parsing of a token stream, tokens are pulled one at a time so lexing and parsing
+# run as one pipeline. terminals are pushed as they are, a reduction replaces the handle by the
+# result of its rules application (or the left hand side if there is none). after the last token
+# the empty word is read as end of the input. returns the value standing for the whole input
+def parse(table: ParseTable, tokens: Iterable[Any], name: Callable[[Any], str] = token_name) -> Any:
+
+    action: list[list[int]] = table.action
+    goto: list[list[int]] = table.goto
+    terminals: dict[str, int] = table.terminals
+    rules: list[G.Rule] | tuple[G.Rule, ...] = table.rules
+    lengths: list[int] = table.lengths
+    lhs: list[int] = table.lhs
+    end: int = terminals.get("", ERROR)
+
+    # states[i] is the parser state after reading values[:i]
+    states: list[int] = [0]
+    values: list[Any] = []
+
+    stream = iter(tokens)
+    token: Any = next(stream, None)
+    index: int = 0
+    column: int = end if token is None else terminals.get(name(token), ERROR)
+
+    while True:
+        if column == ERROR:
+            raise ParseException("unexpected " + __describe(token, index, name))
+        next_action: int = action[states[-1]][column]
+
+        # shift
+        if next_action >= 0:
+            states.append(next_action)
+            values.append(token)
+            token = next(stream, None)
+            index += 1
+            column = end if token is None else terminals.get(name(token), ERROR)
+            continue
+
+        # accepting on an end marker of the grammar, nothing may follow it
+        if next_action == ACCEPT:
+            following: Any = None if token is None else next(stream, None)
+            if following is not None:
+                raise ParseException("unexpected " + __describe(following, index + 1, name) + " after the end of the input")
+            return values[-1]
+
+        if next_action == ERROR:
+            raise ParseException("unexpected " + ("end of input" if token is None else __describe(token, index, name)))
+
+        # reduce, the state below the handle decides where to go next
+        rule: int = -3 - next_action
+        length: int = lengths[rule]
+        application: Callable[[G.String], Any] | None = rules[rule].application
+        if length:
+            handle: list[Any] = values[-length:]
+            del values[-length:]
+            del states[-length:]
+        else:
+            handle = []
+        values.append(rules[rule].lhs if application is None else application(G.String(handle)))
+
+        state: int = goto[states[-1]][lhs[rule]]
+        if state < 0:
+            raise ParseException("no goto for " + str(rules[rule].lhs) + " in state " + str(states[-1]))
+        states.append(state)
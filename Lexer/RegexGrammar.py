@@ -1,4 +1,5 @@
 import Grammar as G
+from Cache import Lazy, LRUCache
 from typing import Self
 
 # Base Regex, represent a regex rule
@@ -218,8 +219,8 @@ starting_rule = G.Rule(G.NonTerminal("S"), G.String([RegexExpression(), G.Termin
 
 
 
-def regex_grammar(tokens: str) -> G.Grammar:
-    rules: list[G.Rule] = [
+def regex_rules(tokens: str) -> list[G.Rule]:
+    return [
         starting_rule,
         token_regex_rule,
         *token_application_rule(tokens),
@@ -238,9 +239,24 @@ def regex_grammar(tokens: str) -> G.Grammar:
         contact_regex_rule,
         concat_rule
     ]
-    return G.rules2grammar(rules, G.NonTerminal("S"))
 
-grammar = regex_grammar("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890_")
+def __build_grammar(tokens: str) -> G.Grammar:
+    grammar: G.Grammar = G.rules2grammar(regex_rules(tokens), G.NonTerminal("S"))
+    grammar.freeze()
+    return grammar
+
+# grammars are shared by everyone compiling regexes over the same alphabet
+GRAMMAR_CACHE_SIZE: int = 16
+__grammars: LRUCache[str, G.Grammar] = LRUCache(GRAMMAR_CACHE_SIZE)
+
+def alphabet_key(tokens: str) -> str:
+    return "".join(sorted(set(tokens)))
+
+def regex_grammar(tokens: str) -> G.Grammar:
+    return __grammars.get_or_build(alphabet_key(tokens), __build_grammar)
+
+# built on first use
+grammar: Lazy[G.Grammar] = Lazy(lambda: regex_grammar("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890_"))
 
 """
 for nt in grammar.nonterminals:
@@ -1,171 +1,86 @@
 import RegexGrammar as RG
 import Grammar as G
-import copy
-import time
-
-class Item:
-    rule: G.Rule
-    next_token: int
-    look_ahead: set[G.Terminal]
-
-    def __init__(self, rule: G.Rule, next_token: int = 0, look_ahead: set[G.Terminal] = []) -> None:
-        self.rule = rule
-        self.next_token = next_token
-        self.look_ahead = look_ahead
-    
-
-    def is_final(self) -> bool:
-        return self.rule.rhs[self.next_token] == G.Empty()
-    
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Item): return False
-        if self.rule != other.rule: return False
-        if self.next_token != other.next_token: return False
-        if self.look_ahead != other.look_ahead: return False
-        return True
-    
-    def __str__(self) -> str:
-        return str(self.rule.lhs) + "->" + str(self.rule.rhs)[:self.next_token] + "." + str(self.rule.rhs)[self.next_token:]
-
-    def __hash__(self) -> int:
-        s: int = hash(str(self))
-        for t in self.look_ahead:
-            s ^= hash(t)
-        return s
-
-
-
-class Node:
-    items: set[Item]
-    __grammar: G.Grammar
-
-    def __init__(self, item: Item | set[Item], grammar: G.Grammar) -> None:
-        if isinstance(item, Item):
-            self.items = set([item])
-        elif isinstance(item, set):
-            self.items = item
-        self.__grammar = grammar
-
-        self.complete()
-    
-    def complete(self) -> None:
-        while True:
-            new_items: set[Item] = set()
-            for item in self.items:
-
-                C = item.rule.rhs[item.next_token]
-                d = item.rule.rhs[item.next_token + 1]
-
-                if isinstance(C, G.NonTerminal):
-                    # compute lookahead set
-                    look_ahead: set[G.Terminal] = set(self.__grammar.first(d))
-                    # if d can derive empty or is empty, also include this items lookahead
-                    if G.Empty() in look_ahead or d == G.Empty():
-                        look_ahead.update(item.look_ahead)
-                    
-                    # add new item to node
-                    for rule in self.__grammar.rules:
-                        if rule.lhs == C:
-                            new_items.add(Item(rule, 0, look_ahead))
-
-            # break condition
-            if new_items.issubset(self.items):
-                self.items.update(new_items)
-                break
-            self.items.update(new_items)
-    
-    def next_symbol(self) -> set[G.Symbol]:
-        symbols: set[G.Symbol] = set()
-        for item in self.items:
-            C: G.Symbol = item.rule.rhs[item.next_token]
-
-            # this is a final item
-            if C == G.Empty():
-                continue
-            symbols.add(C)
-        return symbols
-    
-    def transition_items(self, symbol: G.Symbol) -> set[Item]:
-        items: set[Item] = set()
-        for item in self.items:
-            if item.rule.rhs[item.next_token] == symbol:
-                new_item: Item = copy.deepcopy(item)
-                new_item.next_token += 1
-                items.add(new_item)
-        return items
-
-                
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Node): return False
-        return self.items == other.items
+import hashlib
+import pathlib
+import numpy as np
+from Cache import CACHE_DIRECTORY, LRUCache, load_or_build, save_arrays
+from Parser import ParseException, ParseTable, build_table, parse
 
 class RegexParseException(Exception):
     pass
 
+
+
+# generated tables are stored on disk, named after a hash of everything they depend on
+TABLE_VERSION: str = "2"
+TABLE_DIRECTORY: pathlib.Path | None = CACHE_DIRECTORY / "tables"
+TABLE_CACHE_FILES: int = 64
+
+def __symbol_key(symbol: G.Symbol) -> str:
+    return ("T" if isinstance(symbol, G.Terminal) else "N") + symbol.value
+
+# identifies the rules alone, things derived from what a regex means (like compiled dfas) are keyed by it
+def grammar_hash(rules: list[G.Rule] | tuple[G.Rule, ...], start: G.NonTerminal) -> str:
+    h = hashlib.sha256(__symbol_key(start).encode())
+    for rule in rules:
+        h.update(b"\0" + "\x1f".join(__symbol_key(x) for x in [rule.lhs, *rule.rhs.symbols]).encode())
+    return h.hexdigest()
+
+def table_hash(rules: list[G.Rule] | tuple[G.Rule, ...], start: G.NonTerminal) -> str:
+    h = hashlib.sha256(TABLE_VERSION.encode())
+    h.update(b"\0" + grammar_hash(rules, start).encode())
+    return h.hexdigest()
+
+def save_table(path: pathlib.Path, key: str, table: ParseTable) -> None:
+    save_arrays(path, [
+        np.array(key),
+        np.array(list(table.terminals)),
+        np.array(list(table.nonterminals)),
+        np.array(table.action, dtype=np.int32),
+        np.array(table.goto, dtype=np.int32)
+    ])
+
+def load_table(path: pathlib.Path, key: str, rules: list[G.Rule] | tuple[G.Rule, ...]) -> ParseTable | None:
+
+    if not path.is_file(): return None
+
+    try:
+        with open(path, 'rb') as f:
+            if np.load(f).item() != key: return None
+            terminals = np.load(f).tolist()
+            nonterminals = np.load(f).tolist()
+            action = np.load(f).tolist()
+            goto = np.load(f).tolist()
+    except (OSError, ValueError, EOFError):
+        return None
+
+    return ParseTable(terminals, nonterminals, rules, action, goto)
+
+def __regex_table(allowed: str) -> ParseTable:
+
+    if TABLE_DIRECTORY is None:
+        return build_table(RG.regex_grammar(allowed))
+
+    # the key only needs the rules, a stored table skips the grammar analysis
+    rules: list[G.Rule] = RG.regex_rules(allowed)
+    key: str = table_hash(rules, RG.starting_rule.lhs)
+    return load_or_build(TABLE_DIRECTORY / (key + ".npy"), lambda x: load_table(x, key, rules),
+                         lambda: build_table(RG.regex_grammar(allowed)), lambda x, table: save_table(x, key, table), TABLE_CACHE_FILES)
+
+__tables: LRUCache[str, ParseTable] = LRUCache(RG.GRAMMAR_CACHE_SIZE)
+
+def regex_table(allowed: str) -> ParseTable:
+    return __tables.get_or_build(RG.alphabet_key(allowed), __regex_table)
+
 def regex_parse(s: str, allowed: str = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890_"):
 
-    starting_node: Node = Node(Item(RG.starting_rule), RG.regex_grammar(allowed))
-
-    stack: G.String = G.String([])
-    consume: G.String = G.String([G.Terminal(x) for x in s] + [G.Terminal("EOL")])
-
-    while True:
-
-        current_node: Node = starting_node
-        
-        # setup phase
-        for symbol in stack.symbols:
-            if not symbol in current_node.next_symbol():
-                raise RegexParseException
-            new_items = current_node.transition_items(symbol)
-            current_node = Node(new_items, RG.regex_grammar(allowed))
-        
-        # shift
-        while True:
-            symbol = consume[0]
-            if symbol == G.Empty():
-                # we finished reading
-                return stack[0]
-            if not symbol in current_node.next_symbol():
-                # reduce after this
-                break
-            new_items = current_node.transition_items(symbol)
-            current_node = Node(new_items, RG.regex_grammar(allowed))
-            stack.symbols.append(symbol)
-            consume = G.String(consume.symbols[1:])
-            print("shifting:", symbol, " stack:", stack)
-        
-        # reduce
-        reduced = False
-        for item in current_node.items:
-
-            # check if this is a final item
-            if not item.is_final():
-                continue
-
-            
-            # check if lookahead is included
-            if not consume[0] in item.look_ahead:
-                continue
-            
-
-            # check if there are enough symbols on the stack
-            rule_length: int = len(item.rule.rhs.symbols)
-            if len(stack.symbols) < rule_length:
-                continue
-
-            # check if end of stack matches rule
-            end_of_stack = G.String(stack.symbols[-rule_length:])
-            if end_of_stack == item.rule.rhs:
-                reduced = True
-                new_symbol = item.rule.application(end_of_stack)
-                stack = G.String(stack.symbols[:-rule_length] + [new_symbol])
-                print("reducing:", item, " stack:", stack)
-                break
-        
-        if not reduced:
-            raise RegexParseException
+    # the regex grammar reads its own end marker, reading it accepts
+    tokens: list[G.Terminal] = [G.Terminal(x) for x in s]
+    tokens.append(G.Terminal("EOL"))
+    try:
+        return parse(regex_table(allowed), tokens)
+    except ParseException as e:
+        raise RegexParseException(str(e)) from None
 
 # id_reg = "([a]|[b]|[c]|[d]|[e]|[f]|[g]|[h]|[i]|[j]|[k]|[l]|[m]|[n]|[o]|[p]|[q]|[r]|[s]|[t]|[u]|[v]|[w]|[x]|[y]|[z]|[A]|[B]|[C]|[D]|[E]|[F]|[G]|[H]|[I]|[J]|[K]|[L]|[M]|[N]|[O]|[P]|[Q]|[R]|[S]|[T]|[U]|[V]|[W]|[X]|[Y]|[Z]|[_])(([a]|[b]|[c]|[d]|[e]|[f]|[g]|[h]|[i]|[j]|[k]|[l]|[m]|[n]|[o]|[p]|[q]|[r]|[s]|[t]|[u]|[v]|[w]|[x]|[y]|[z]|[A]|[B]|[C]|[D]|[E]|[F]|[G]|[H]|[I]|[J]|[K]|[L]|[M]|[N]|[O]|[P]|[Q]|[R]|[S]|[T]|[U]|[V]|[W]|[X]|[Y]|[Z]|[_]|[0]|[1]|[2]|[3]|[4]|[5]|[6]|[7]|[8]|[9])*)"
 
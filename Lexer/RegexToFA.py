@@ -27,3 +27,80 @@ def regex2FA(value: str, tokens: str = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMN
     return __regex2FArec(parsed)
 
 
+
+
+
+# positions of the expression tree, ranges[p] is the (low, high) character range read at position p
+class Positions:
+    ranges: list[tuple[int, int]]
+    follow: list[set[int]]
+
+    def __init__(self) -> None:
+        self.ranges = []
+        self.follow = []
+
+    def add(self, low: int, high: int) -> int:
+        self.ranges.append((low, high))
+        self.follow.append(set())
+        return len(self.ranges) - 1
+
+# returns nullable, first and last positions of e and records the follow positions
+def __glushkovrec(e: G.RegexExpression, positions: Positions) -> tuple[bool, set[int], set[int]]:
+    if isinstance(e, G.ConcatExpression):
+        nullable0, first0, last0 = __glushkovrec(e.lhs, positions)
+        nullable1, first1, last1 = __glushkovrec(e.rhs, positions)
+        for p in last0:
+            positions.follow[p].update(first1)
+        return nullable0 and nullable1, first0 | first1 if nullable0 else first0, last0 | last1 if nullable1 else last1
+    elif isinstance(e, G.ChoiceExpression):
+        nullable0, first0, last0 = __glushkovrec(e.lhs, positions)
+        nullable1, first1, last1 = __glushkovrec(e.rhs, positions)
+        return nullable0 or nullable1, first0 | first1, last0 | last1
+    elif isinstance(e, G.AugmentExpression):
+        nullable, first, last = __glushkovrec(e.body, positions)
+        for p in last:
+            positions.follow[p].update(first)
+        return True, first, last
+    elif isinstance(e, G.QuestionMarkExpression):
+        nullable, first, last = __glushkovrec(e.body, positions)
+        return True, first, last
+    elif isinstance(e, G.PlusExpression):
+        nullable, first, last = __glushkovrec(e.body, positions)
+        for p in last:
+            positions.follow[p].update(first)
+        return nullable, first, last
+    elif isinstance(e, G.ParenthesesExpression):
+        return __glushkovrec(e.body, positions)
+    elif isinstance(e, G.TokenExpression):
+        p = positions.add(ord(e.token), ord(e.token))
+        return False, set([p]), set([p])
+    elif isinstance(e, G.SpreadExpression):
+        p = positions.add(ord(e.token1), ord(e.token2))
+        return False, set([p]), set([p])
+    elif isinstance(e, G.RegexExpression):
+        return __glushkovrec(e.container, positions)
+
+# epsilon free position automaton, state 0 is the start and state p + 1 is reached by reading position p
+def regex2glushkov(value: str, tokens: str = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890_") -> FA.FiniteAutomaton:
+    parsed: G.RegexExpression = RP.regex_parse(value, tokens)
+
+    positions: Positions = Positions()
+    nullable, first, last = __glushkovrec(parsed, positions)
+
+    fa = FA.FiniteAutomaton()
+    for i in range(len(positions.ranges) + 1):
+        fa.add_node()
+    fa.define_start(0)
+
+    for q in sorted(first):
+        fa.add_range(0, q + 1, *positions.ranges[q])
+    for p, follow in enumerate(positions.follow):
+        for q in sorted(follow):
+            fa.add_range(p + 1, q + 1, *positions.ranges[q])
+
+    if nullable:
+        fa.define_end(0)
+    for p in sorted(last):
+        fa.define_end(p + 1)
+
+    return fa
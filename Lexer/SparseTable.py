@@ -0,0 +1,157 @@
+import numpy as np
+import Parser as P
+
+# row displacement storage of a mostly default table
+# row r keeps its entries at values[base[r] + column], check tells which row an entry belongs to,
+# everything else is default[r]. slots past the end of the arrays belong to no row
+class SparseTable:
+    rows: int
+    columns: int
+
+    default: np.ndarray
+    base: np.ndarray
+    check: np.ndarray
+    values: np.ndarray
+
+    def __init__(self, default: np.ndarray, base: np.ndarray, check: np.ndarray, values: np.ndarray, columns: int) -> None:
+        self.rows = len(default)
+        self.columns = columns
+        self.default = default
+        self.base = base
+        self.check = check
+        self.values = values
+
+    def get(self, row: int, column: int) -> int:
+        i: int = self.base.item(row) + column
+        if i < len(self.check) and self.check.item(i) == row: return self.values.item(i)
+        return self.default.item(row)
+
+    # table[row][column] reads like the dense lists do
+    def __getitem__(self, row: int) -> "SparseRow":
+        return SparseRow(self, row)
+
+    def get_many(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        i: np.ndarray = self.base[rows] + columns
+        inside: np.ndarray = i < len(self.check)
+        i = np.where(inside, i, 0)
+        return np.where(inside & (self.check[i] == rows), self.values[i], self.default[rows])
+
+    def dense(self) -> np.ndarray:
+        rows: np.ndarray = np.repeat(np.arange(self.rows, dtype=np.int32), self.columns)
+        columns: np.ndarray = np.tile(np.arange(self.columns, dtype=np.int32), self.rows)
+        return self.get_many(rows, columns).reshape(self.rows, self.columns)
+
+    def nbytes(self) -> int:
+        return self.default.nbytes + self.base.nbytes + self.check.nbytes + self.values.nbytes
+
+    # stored with Cache.save_arrays like the dense tables
+    def arrays(self) -> list[np.ndarray]:
+        return [np.array(self.columns), self.default, self.base, self.check, self.values]
+
+class SparseRow:
+    __slots__ = ("table", "row")
+
+    table: SparseTable
+    row: int
+
+    def __init__(self, table: SparseTable, row: int) -> None:
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, column: int) -> int:
+        return self.table.get(self.row, column)
+
+def from_arrays(arrays: list[np.ndarray]) -> SparseTable:
+    return SparseTable(arrays[1], arrays[2], arrays[3], arrays[4], arrays[0].item())
+
+# the most frequent value of every row
+def row_defaults(table: np.ndarray) -> np.ndarray:
+    defaults: np.ndarray = np.empty(len(table), dtype=np.int32)
+    for r, row in enumerate(table):
+        values, counts = np.unique(row, return_counts=True)
+        defaults[r] = values[np.argmax(counts)]
+    return defaults
+
+# entries equal to their rows default are dropped, so are the ones marked in ignore
+# rows are placed first fit, the ones with the most entries first
+def compress(table: list[list[int]] | np.ndarray, defaults: list[int] | np.ndarray | None = None, ignore: np.ndarray | None = None) -> SparseTable:
+
+    dense: np.ndarray = np.asarray(table, dtype=np.int32).reshape(len(table), -1)
+    rows, columns = dense.shape
+    default: np.ndarray = row_defaults(dense) if defaults is None else np.asarray(defaults, dtype=np.int32)
+
+    kept: np.ndarray = dense != default[:, None]
+    if ignore is not None:
+        kept &= ~ignore
+
+    base: np.ndarray = np.zeros(rows, dtype=np.int32)
+    occupied: np.ndarray = np.zeros(rows * columns + columns, dtype=bool)
+    size: int = 0
+
+    for r in sorted(range(rows), key=lambda r: -int(kept[r].sum())):
+        entries: np.ndarray = np.flatnonzero(kept[r])
+        if len(entries) == 0: continue
+
+        # a base fits if every entry lands on a free slot, all bases are tried at once
+        candidates: int = size + 1
+        fits: np.ndarray = np.ones(candidates, dtype=bool)
+        for c in entries:
+            fits &= ~occupied[c:c + candidates]
+        b: int = int(np.argmax(fits))
+
+        base[r] = b
+        occupied[b + entries] = True
+        size = max(size, b + int(entries[-1]) + 1)
+
+    # one free slot at least, so that out of range lookups have something to compare against
+    check: np.ndarray = np.full(max(size, 1), -1, dtype=np.int32)
+    values: np.ndarray = np.zeros(max(size, 1), dtype=np.int32)
+    for r in range(rows):
+        entries = np.flatnonzero(kept[r])
+        check[base[r] + entries] = r
+        values[base[r] + entries] = dense[r, entries]
+
+    return SparseTable(default, base, check, values, columns)
+
+# dfa rows default to their most frequent target, which is the dead state for most of them
+def compress_dfa(transitions: np.ndarray) -> SparseTable:
+    return compress(transitions)
+
+# action rows that reduce default to their most frequent reduction, which also takes over their
+# error entries. a wrong token is then still caught before it is shifted, only after the reductions.
+# goto rows default to their most frequent target, error entries are never consulted
+def compress_parse_table(table: P.ParseTable, default_reductions: bool = True) -> tuple[SparseTable, SparseTable]:
+
+    action: np.ndarray = np.asarray(table.action, dtype=np.int32).reshape(len(table.action), -1)
+    defaults: np.ndarray = np.full(len(action), P.ERROR, dtype=np.int32)
+    ignore: np.ndarray | None = None
+
+    if default_reductions:
+        for r, row in enumerate(action):
+            reductions: np.ndarray = row[row < P.ACCEPT]
+            if len(reductions):
+                values, counts = np.unique(reductions, return_counts=True)
+                defaults[r] = values[np.argmax(counts)]
+        ignore = (action == P.ERROR) & (defaults[:, None] != P.ERROR)
+
+    goto: np.ndarray = np.asarray(table.goto, dtype=np.int32).reshape(len(table.goto), -1)
+    goto_defaults: np.ndarray = np.empty(len(goto), dtype=np.int32)
+    for r, row in enumerate(goto):
+        targets: np.ndarray = row[row != P.ERROR]
+        if len(targets):
+            values, counts = np.unique(targets, return_counts=True)
+            goto_defaults[r] = values[np.argmax(counts)]
+        else:
+            goto_defaults[r] = P.ERROR
+
+    return compress(action, defaults, ignore), compress(goto, goto_defaults, goto == P.ERROR)
+
+# parse table reading compressed action and goto tables, Parser.parse takes it like the dense one
+class SparseParseTable(P.ParseTable):
+    action: SparseTable
+    goto: SparseTable
+
+    def __init__(self, table: P.ParseTable, default_reductions: bool = True) -> None:
+        action, goto = compress_parse_table(table, default_reductions)
+        super().__init__(list(table.terminals), list(table.nonterminals), table.rules, action, goto)
+        self.conflicts = table.conflicts
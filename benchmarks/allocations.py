@@ -0,0 +1,59 @@
+import pathlib
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+sys.setrecursionlimit(100000)
+
+import Grammar as G
+import RegexGrammar as RG
+import RegexParser as RP
+
+# object churn of the grammar machinery, counted as constructor and deepcopy calls of the
+# python level objects together with the peak traced memory
+
+ALPHABET: str = "abc"
+PIECES: list[str] = ["[a]", "([b]|[c])*", "[[a]-[c]]+", "([a]?)"]
+
+def make_regex(length: int) -> str:
+    result: str = ""
+    i: int = 0
+    while len(result) < length:
+        result += PIECES[i % len(PIECES)]
+        i += 1
+    return result
+
+def count(run) -> tuple[int, int, float, int]:
+    counts: dict[str, int] = {"__init__": 0, "deepcopy": 0}
+
+    def profile(frame, event: str, arg) -> None:
+        if event == "call" and frame.f_code.co_name in counts:
+            counts[frame.f_code.co_name] += 1
+
+    tracemalloc.start()
+    sys.setprofile(profile)
+    run()
+    sys.setprofile(None)
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    t = time.perf_counter()
+    run()
+    return counts["__init__"], counts["deepcopy"], time.perf_counter() - t, peak
+
+if __name__ == "__main__":
+
+    value: str = make_regex(2000)
+    RP.regex_table(ALPHABET)
+
+    cases = [
+        ("grammar analysis", lambda: G.rules2grammar(RG.regex_rules(ALPHABET), RG.starting_rule.lhs)),
+        ("table construction", lambda: RP.build_table(RG.regex_grammar(ALPHABET))),
+        ("parse 2000 chars", lambda: RP.regex_parse(value, ALPHABET)),
+    ]
+
+    print(f"{'case':>20} {'constructors':>13} {'deepcopies':>11} {'seconds':>9} {'peak KiB':>9}")
+    for name, run in cases:
+        constructed, copied, elapsed, peak = count(run)
+        print(f"{name:>20} {constructed:>13} {copied:>11} {elapsed:>9.3f} {peak / 1024:>9.0f}")
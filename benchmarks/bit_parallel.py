@@ -0,0 +1,54 @@
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import BitNFA as B
+import DFA as D
+import FiniteAutomaton as FA
+import RegexToFA as R2FA
+
+# nfa simulation with python sets against the bit parallel engine, on the same words
+
+PATTERNS: dict[str, tuple[str, str]] = {
+    "identifier": D.IDENTIFIER,
+    "integer": D.INTEGER,
+    "suffix": ("([a]|[b])*[a]" + "([a]|[b])" * 12, "ab"),
+}
+
+def set_run(fa: FA.FiniteAutomaton, alphabet: str, word: str) -> bool:
+    current: set[int] = fa.closure(fa.start)
+    for c in word:
+        if not c in alphabet: return False
+        current = fa.next_state(current, c)
+        if not current: return False
+    return fa.accepts(current)
+
+def words(alphabet: str, count: int = 2000) -> list[str]:
+    rnd = random.Random(0)
+    return ["".join(rnd.choice(alphabet) for i in range(rnd.randint(8, 40))) for j in range(count)]
+
+if __name__ == "__main__":
+
+    print(f"{'pattern':>12} {'states':>7} {'compile':>9} {'sets us/char':>13} {'bits us/char':>13}")
+    for name, (regex, alphabet) in PATTERNS.items():
+        fa = R2FA.regex2FA(regex, alphabet)
+        sample: list[str] = words(alphabet)
+        characters: int = sum(len(w) for w in sample)
+
+        t = time.perf_counter()
+        engine = B.BitNFA(fa, alphabet)
+        compile_time: float = time.perf_counter() - t
+
+        t = time.perf_counter()
+        expected: list[bool] = [set_run(fa, alphabet, w) for w in sample]
+        sets: float = time.perf_counter() - t
+
+        t = time.perf_counter()
+        result: list[bool] = [engine.run(w) for w in sample]
+        bits: float = time.perf_counter() - t
+
+        assert result == expected
+        print(f"{name:>12} {fa.size:>7} {compile_time:>8.3f}s {sets / characters * 1e6:>13.2f} {bits / characters * 1e6:>13.2f}")
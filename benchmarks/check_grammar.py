@@ -0,0 +1,76 @@
+import pathlib
+import random
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import Grammar as G
+from check_lalr import GRAMMARS, random_specs, rules
+
+# nullable, FIRST and FOLLOW of Grammar against the textbook fixpoint over plain sets,
+# the end of the input is the empty word "" in both
+# usage: python benchmarks/check_grammar.py [random grammars]
+
+TEXTBOOK: tuple[str, list[str]] = ("E", ["E -> T X", "X -> + T X", "X ->", "T -> ( E )", "T -> i"])
+
+def fixpoint(start: str, specs: list[str]) -> tuple[set[str], dict[str, set[str]], dict[str, set[str]]]:
+    split: list[tuple[str, list[str]]] = [(lhs.strip(), rhs.split()) for lhs, rhs in (spec.split("->") for spec in specs)]
+    names: set[str] = set(lhs for lhs, rhs in split) | set(x for lhs, rhs in split for x in rhs if x[0].isupper())
+
+    nullable: set[str] = set()
+    first: dict[str, set[str]] = {n: set() for n in names}
+    follow: dict[str, set[str]] = {n: set() for n in names}
+    follow[start].add("")
+
+    changed: bool = True
+    while changed:
+        changed = False
+        for lhs, rhs in split:
+            if all(x in nullable for x in rhs) and not lhs in nullable:
+                nullable.add(lhs)
+                changed = True
+
+            for x in rhs:
+                found: set[str] = first[x] if x[0].isupper() else {x}
+                if found - first[lhs]:
+                    first[lhs] |= found
+                    changed = True
+                if not x in nullable: break
+
+            # whatever can come after x inside the rule, and follow of lhs if all of it may vanish
+            for i, x in enumerate(rhs):
+                if not x[0].isupper(): continue
+                after: set[str] = set()
+                for y in rhs[i + 1:]:
+                    after |= first[y] if y[0].isupper() else {y}
+                    if not y in nullable: break
+                else:
+                    after |= follow[lhs]
+                if after - follow[x]:
+                    follow[x] |= after
+                    changed = True
+
+    return nullable, first, follow
+
+def check(start: str, specs: list[str]) -> None:
+    grammar: G.Grammar = G.rules2grammar(rules(specs), G.NonTerminal(start))
+    nullable, first, follow = fixpoint(start, specs)
+    for n in first:
+        symbol: G.NonTerminal = G.NonTerminal(n)
+        assert grammar.nullable(symbol) == (n in nullable), (specs, n)
+        assert set(t.value for t in grammar.first(symbol)) == first[n] | ({""} if n in nullable else set()), (specs, n)
+        assert set(t.value for t in grammar.follow(symbol)) == follow[n], (specs, n, grammar.follow(symbol), follow[n])
+
+if __name__ == "__main__":
+
+    check(*TEXTBOOK)
+    follow: list[str] = [t.value for t in G.rules2grammar(rules(TEXTBOOK[1]), G.NonTerminal("E")).follow(G.NonTerminal("X"))]
+    assert sorted(follow) == ["", ")"], follow
+    for name, (start, specs) in GRAMMARS.items():
+        check(start, specs)
+
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rnd = random.Random(0)
+    for i in range(count):
+        check("S", random_specs(rnd))
+    print(f"nullable, first and follow match the fixpoint on {count + len(GRAMMARS) + 1} grammars")
@@ -0,0 +1,118 @@
+import pathlib
+import random
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import Grammar as G
+import Parser as P
+import SparseTable as SP
+
+# LALR(1) tables against canonical LR(1) tables and a brute force recognizer. grammars without
+# conflicts must accept exactly the words they derive, and both tables must build the same trees.
+# the compressed LALR tables, with and without default reductions, must build them too
+# usage: python benchmarks/check_lalr.py [random grammars]
+
+GRAMMARS: dict[str, tuple[str, list[str]]] = {
+    "expressions": ("E", ["E -> E + T", "E -> T", "T -> T * F", "T -> F", "F -> ( E )", "F -> i"]),
+    "assignments": ("S", ["S -> L = R", "S -> R", "L -> * R", "L -> i", "R -> L"]),
+    "nullable": ("S", ["S -> A B c", "A -> a A", "A ->", "B -> b B", "B ->", "S -> d"]),
+    "declarations": ("P", ["P -> D ; P", "P ->", "D -> T V", "T -> int", "T -> float", "V -> i , V", "V -> i"]),
+    "chains": ("S", ["S -> A B C d", "A -> a", "A ->", "B -> A", "C -> c", "C -> B"]),
+    # LR(1) but not LALR(1), merging the states after c mixes up the lookaheads of A and B
+    "not lalr": ("S", ["S -> a A d", "S -> b B d", "S -> a B e", "S -> b A e", "A -> c", "B -> c"]),
+}
+LENGTH: int = 5
+END: str = "$"
+
+# a rule builds the tree (rule, children), which tells the two parsers apart wherever they reduce differently
+def rules(specs: list[str]) -> list[G.Rule]:
+    result: list[G.Rule] = []
+    for r, spec in enumerate(specs):
+        lhs, rhs = spec.split("->")
+        symbols: list[G.Symbol] = [G.NonTerminal(x) if x[0].isupper() else G.Terminal(x) for x in rhs.split()]
+        result.append(G.Rule(G.NonTerminal(lhs.strip()), G.String(symbols or [G.EMPTY]), lambda x, r=r: (r, tuple(x))))
+    return result
+
+def tables(start: str, specs: list[str]) -> tuple[P.ParseTable, P.ParseTable]:
+    lalr: P.ParseTable = P.build_lalr_table(G.rules2grammar(rules(specs), G.NonTerminal(start)))
+    # the canonical construction reads an explicit end marker
+    marked: list[G.Rule] = rules(specs) + rules(["Z -> " + start + " " + END])[:1]
+    canonical: P.ParseTable = P.build_table(G.rules2grammar(marked, G.NonTerminal("Z")))
+    return lalr, canonical
+
+# (lhs, i, j) for every nonterminal deriving word[i:j], grown until nothing changes
+def derivations(specs: list[str], word: list[str]) -> set[tuple[str, int, int]]:
+    split: list[tuple[str, list[str]]] = [(lhs.strip(), rhs.split()) for lhs, rhs in (spec.split("->") for spec in specs)]
+    known: set[tuple[str, int, int]] = set()
+    changed: bool = True
+    while changed:
+        changed = False
+        for lhs, rhs in split:
+            for i in range(len(word) + 1):
+                ends: set[int] = {i}
+                for symbol in rhs:
+                    if symbol[0].isupper():
+                        ends = {j for (n, e, j) in known if n == symbol and e in ends}
+                    else:
+                        ends = {e + 1 for e in ends if e < len(word) and word[e] == symbol}
+                for j in ends:
+                    if not (lhs, i, j) in known:
+                        known.add((lhs, i, j))
+                        changed = True
+    return known
+
+def outcome(table: P.ParseTable, word: list[str]) -> object:
+    try:
+        return P.parse(table, word, name=lambda x: x)
+    except P.ParseException:
+        return None
+
+def words(terminals: list[str], length: int) -> list[list[str]]:
+    result: list[list[str]] = [[]]
+    level: list[list[str]] = [[]]
+    for n in range(length):
+        level = [w + [t] for w in level for t in terminals]
+        result += level
+    return result
+
+# counts of (words checked, words accepted), None if the grammar has conflicts
+def check(start: str, specs: list[str]) -> tuple[int, int] | None:
+    lalr, canonical = tables(start, specs)
+    if lalr.conflicts or canonical.conflicts: return None
+
+    compressed: list[P.ParseTable] = [SP.SparseParseTable(lalr, False), SP.SparseParseTable(lalr)]
+    terminals: list[str] = sorted(set(x for spec in specs for x in spec.split("->")[1].split() if not x[0].isupper()))
+    accepted: int = 0
+    sample: list[list[str]] = words(terminals, LENGTH if len(terminals) < 6 else 3)
+    for word in sample:
+        tree: object = outcome(lalr, word)
+        assert tree == outcome(canonical, word + [END]), (specs, word)
+        assert all(tree == outcome(table, word) for table in compressed), (specs, word)
+        assert (tree is not None) == ((start, 0, len(word)) in derivations(specs, word)), (specs, word)
+        accepted += tree is not None
+    return len(sample), accepted
+
+def random_specs(rnd: random.Random) -> list[str]:
+    nonterminals: list[str] = ["S", "A", "B", "C"]
+    terminals: list[str] = ["a", "b", "c"]
+    specs: list[str] = []
+    for n in nonterminals:
+        for k in range(rnd.randint(1, 3)):
+            specs.append(n + " -> " + " ".join(rnd.choice(nonterminals + terminals * 2) for x in range(rnd.randint(0, 3))))
+    return specs
+
+if __name__ == "__main__":
+
+    for name, (start, specs) in GRAMMARS.items():
+        lalr, canonical = tables(start, specs)
+        result: tuple[int, int] | None = check(start, specs)
+        counts: str = "conflicts" if result is None else f"{result[0]:>5} words, {result[1]:>4} accepted"
+        print(f"{name:>14} {len(lalr.action):>4} lalr states {len(canonical.action):>4} canonical states, {counts}")
+    assert check(*GRAMMARS["not lalr"]) is None and not tables(*GRAMMARS["not lalr"])[1].conflicts
+
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rnd = random.Random(0)
+    results: list[tuple[int, int] | None] = [check("S", random_specs(rnd)) for i in range(count)]
+    checked: list[tuple[int, int]] = [x for x in results if x is not None]
+    print(f"{count} random grammars, {len(checked)} without conflicts, {sum(x[0] for x in checked)} words, {sum(x[1] for x in checked)} accepted")
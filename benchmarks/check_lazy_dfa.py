@@ -0,0 +1,77 @@
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import DFA as D
+import LazyDFA as LD
+import RegexToFA as R2FA
+
+# LazyDFA.run against DFA.run on random words, with budgets small enough that the cache is flushed
+# all the time and runs fall back to nfa simulation. then the exponential suffix pattern on one long
+# word, whose full dfa would have millions of states
+# usage: python benchmarks/check_lazy_dfa.py [characters]
+
+PATTERNS: dict[str, tuple[str, str]] = {
+    "identifier": D.IDENTIFIER,
+    "integer": D.INTEGER,
+    "suffix": ("([a]|[b])*[a]" + "([a]|[b])" * 6, "ab"),
+}
+BUDGETS: list[int] = [8, 64, 1 << 16]
+SUFFIX: int = 20
+
+# budgets count nfa states and cached transitions, a state is added before the budget is checked
+# remembers the largest cost the cache ever had and how often runs fell back to the nfa
+class Tracked(LD.LazyDFA):
+
+    peak: int = 0
+    fallbacks: int = 0
+
+    def state(self, nfa_states: frozenset[int]) -> int:
+        key: int = super().state(nfa_states)
+        self.peak = max(self.peak, self.cost)
+        return key
+
+    def simulate(self, nfa_states: frozenset[int] | set[int], word: str) -> bool:
+        self.fallbacks += 1
+        return super().simulate(nfa_states, word)
+
+def words(alphabet: str, count: int = 1000) -> list[str]:
+    rnd = random.Random(0)
+    result: list[str] = ["", "#"]
+    for i in range(count):
+        word: str = "".join(rnd.choice(alphabet) for k in range(rnd.randint(0, 60)))
+        if rnd.random() < 0.1:
+            word += "#"
+        result.append(word)
+    return result
+
+if __name__ == "__main__":
+
+    for name, (regex, alphabet) in PATTERNS.items():
+        dfa = D.DFA(regex, alphabet)
+        sample: list[str] = words(alphabet)
+        expected: list[bool] = [dfa.run(w) for w in sample]
+        for budget in BUDGETS:
+            engine = Tracked(R2FA.regex2FA(regex, alphabet), budget)
+            assert [engine.run(w) for w in sample] == expected, (name, budget)
+            assert engine.peak <= budget + engine.fa.size + 1, (name, budget, engine.peak)
+            print(f"{name:>12} budget {budget:>6}: {engine.flushes:>6} flushes {engine.fallbacks:>5} nfa fallbacks, peak cost {engine.peak}")
+
+    # the word is accepted exactly if it has an a SUFFIX + 1 characters before its end
+    characters: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rnd = random.Random(0)
+    word: str = "".join(rnd.choice("ab") for i in range(characters))
+    fa = R2FA.regex2FA("([a]|[b])*[a]" + "([a]|[b])" * SUFFIX, "ab")
+    for budget in [1 << 14]:
+        for ending in ["a" + "b" * SUFFIX, "b" * (SUFFIX + 1)]:
+            engine = Tracked(fa, budget)
+            t = time.perf_counter()
+            assert engine.run(word + ending) == ending.startswith("a")
+            elapsed: float = time.perf_counter() - t
+            # the cache outgrows its budget by one state at most
+            assert engine.peak <= budget + fa.size + 1, (budget, engine.peak)
+            print(f"{'suffix ' + str(SUFFIX):>12} budget {budget:>6}: {engine.flushes:>6} flushes {engine.fallbacks:>5} nfa fallbacks,"
+                  f" peak cost {engine.peak}, {characters} characters in {elapsed:.2f}s")
@@ -0,0 +1,42 @@
+import pathlib
+import random
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import DFA as D
+
+# DFA.run_many against DFA.run on random words, with characters outside the alphabet, lone surrogates,
+# empty words and batches small enough that words of every length end inside one
+# usage: python benchmarks/check_run_many.py [words]
+
+PATTERNS: dict[str, tuple[str, str]] = {
+    "identifier": D.IDENTIFIER,
+    "integer": D.INTEGER,
+    "suffix": ("([a]|[b])*[a]([a]|[b])([a]|[b])", "ab"),
+}
+STRANGERS: list[str] = ["#", " ", "\0", "é", "\ud800", "\udfff", "\U0001f600"]
+BATCHES: list[int] = [1, 2, 3, 7, 1 << 16]
+
+def words(alphabet: str, count: int) -> list[str]:
+    rnd = random.Random(0)
+    result: list[str] = ["", *STRANGERS]
+    for i in range(count):
+        word: list[str] = [rnd.choice(alphabet) for k in range(rnd.randint(0, 12))]
+        if rnd.random() < 0.2:
+            word.insert(rnd.randint(0, len(word)), rnd.choice(STRANGERS))
+        result.append("".join(word))
+    return result
+
+if __name__ == "__main__":
+
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for name, (regex, alphabet) in PATTERNS.items():
+        dfa = D.DFA(regex, alphabet)
+        sample: list[str] = words(alphabet, count)
+        expected: list[bool] = [dfa.run(w) for w in sample]
+        for batch in BATCHES:
+            result: list[bool] = dfa.run_many(sample, batch).tolist()
+            assert result == expected, (name, batch, [w for w, a, b in zip(sample, result, expected) if a != b][:5])
+        assert dfa.run_many([]).tolist() == []
+        print(f"{name:>12} {len(sample):>6} words, {sum(expected):>6} accepted, run_many matches run")
@@ -0,0 +1,72 @@
+import io
+import mmap
+import pathlib
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import DFA as D
+import Lexer as L
+
+# tokenize_stream against tokenize on random texts, fed from strings, utf-8 bytes and memory maps in
+# chunks small enough that tokens and multi byte characters are split at every possible place
+# usage: python benchmarks/check_stream.py [texts]
+
+TOKENS: list[tuple[str, str, str]] = [
+    ("integer", *D.INTEGER), ("identifier", *D.IDENTIFIER),
+    ("word", "([é]|[ü]|[€])+", "éü€"), ("=", "[=]", "="), ("==", "[=][=]", "="),
+    ("space", "([ ]|[\n])+", " \n"),
+]
+PIECES: list[str] = ["counter", "x_1", "0x1F", "-12", "+0b1_0", "0o17", "12_345", "é€ü", "€", "=", "==", "===", " ", "\n"]
+CHUNKS: list[int] = [1, 2, 3, 4, 5, 7, 64]
+
+def outcome(tokens) -> tuple[list[tuple[str, int, int]], str | None]:
+    result: list[tuple[str, int, int]] = []
+    try:
+        for token in tokens:
+            result.append(token)
+    except L.LexerException as e:
+        return result, str(e)
+    return result, None
+
+def texts(count: int) -> list[str]:
+    rnd = random.Random(0)
+    result: list[str] = ["", " ", "x", "€", "0x", "a#"]
+    for i in range(count):
+        text: str = "".join(rnd.choice(PIECES) for k in range(rnd.randint(1, 12)))
+        # some texts contain a character no token reads
+        if rnd.random() < 0.2:
+            k: int = rnd.randrange(len(text) + 1)
+            text = text[:k] + "#" + text[k:]
+        result.append(text)
+    return result
+
+if __name__ == "__main__":
+
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    lexer = L.Lexer(TOKENS)
+    checked: int = 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: pathlib.Path = pathlib.Path(directory) / "input.txt"
+        for text in texts(count):
+            expected = outcome(lexer.tokenize(text))
+            path.write_bytes(text.encode("utf-8"))
+
+            for chunk in CHUNKS:
+                sources = [("str", io.StringIO(text)), ("bytes", io.BytesIO(text.encode("utf-8")))]
+                for name, source in sources:
+                    result = outcome(lexer.tokenize_stream(source, chunk))
+                    assert result == expected, (text, name, chunk, result, expected)
+                    checked += 1
+
+                # mmap refuses empty files
+                if text:
+                    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                        result = outcome(lexer.tokenize_stream(m, chunk))
+                    assert result == expected, (text, "mmap", chunk, result, expected)
+                    checked += 1
+
+    print(f"tokenize_stream matches tokenize on {checked} runs")
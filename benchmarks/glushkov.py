@@ -0,0 +1,79 @@
+import pathlib
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+sys.setrecursionlimit(100000)
+
+import DFA as D
+import FiniteAutomaton as FA
+import RegexToFA as R2FA
+
+# thompson against glushkov automata: size of the nfa and time spent in fa2dfa. both dfas are run on
+# sampled words and compared with python re, glushkov has to agree everywhere. the thompson
+# combinators of the baseline get ([a][b]*)? wrong (question_accepter over augment_accepter also
+# accepts b, bb, ...), so their mismatches are only counted
+
+KEYWORDS: list[str] = ["if", "else", "elif", "while", "for", "in", "return", "def", "class", "import", "from", "as", "with",
+    "try", "except", "finally", "raise", "pass", "break", "continue", "lambda", "yield", "global", "nonlocal", "assert", "del"]
+
+PATTERNS: dict[str, tuple[str, str]] = {
+    "identifier": D.IDENTIFIER,
+    "integer": D.INTEGER,
+    "keywords": ("|".join("(" + "".join("[" + c + "]" for c in word) + ")" for word in KEYWORDS), "abcdefghijklmnopqrstuvwxyz"),
+    "suffix": ("([a]|[b])*[a]" + "([a]|[b])" * 10, "ab"),
+    "optional": ("([a][b]*)?", "ab"),
+}
+SAMPLES: int = 2000
+
+# [c] is the character c and [[a]-[z]] a range, everything else is an operator with the same meaning in re
+def python_regex(regex: str) -> str:
+    result: list[str] = []
+    for m in re.finditer(r"\[\[(.)\]-\[(.)\]\]|\[(.)\]|([()|*+?])|(.)", regex):
+        low, high, char, operator, other = m.groups()
+        assert other is None, regex
+        if low is not None: result.append("[" + re.escape(low) + "-" + re.escape(high) + "]")
+        elif char is not None: result.append(re.escape(char))
+        else: result.append(operator)
+    return "".join(result)
+
+def words(alphabet: str, extra: list[str]) -> list[str]:
+    rnd = random.Random(0)
+    return extra + ["".join(rnd.choice(alphabet) for i in range(rnd.randint(0, 14))) for j in range(SAMPLES)]
+
+def accepts(dfa: tuple[list[list[int]], list[int], list[int]], alphabet: str, word: str) -> bool:
+    transitions, accept, reject = dfa
+    state: int = 0
+    for c in word:
+        state = transitions[state][alphabet.index(c)]
+    return state in accept
+
+def epsilon_edges(fa: FA.FiniteAutomaton) -> int:
+    return int((fa.edge_array()[2] == FA.EPSILON).sum())
+
+def bench(fa: FA.FiniteAutomaton, alphabet: str) -> tuple[tuple[list[list[int]], list[int], list[int]], float]:
+    t = time.perf_counter()
+    dfa = FA.fa2dfa(fa, alphabet)
+    return dfa, time.perf_counter() - t
+
+if __name__ == "__main__":
+
+    print(f"{'pattern':>12} {'thompson':>9} {'epsilon':>8} {'glushkov':>9} {'dfa':>6} {'fa2dfa thompson':>16} {'fa2dfa glushkov':>16} {'thompson wrong':>15}")
+    for name, (regex, alphabet) in PATTERNS.items():
+        thompson = R2FA.regex2FA(regex, alphabet)
+        glushkov = R2FA.regex2glushkov(regex, alphabet)
+
+        thompson_dfa, thompson_time = bench(thompson, alphabet)
+        glushkov_dfa, glushkov_time = bench(glushkov, alphabet)
+
+        expected = re.compile(python_regex(regex))
+        wrong: int = 0
+        for word in words(alphabet, KEYWORDS if name == "keywords" else []):
+            accepted: bool = expected.fullmatch(word) is not None
+            assert accepts(glushkov_dfa, alphabet, word) == accepted, (name, word)
+            wrong += accepts(thompson_dfa, alphabet, word) != accepted
+
+        print(f"{name:>12} {thompson.size:>9} {epsilon_edges(thompson):>8} {glushkov.size:>9} {len(glushkov_dfa[0]):>6}"
+              f" {thompson_time:>15.4f}s {glushkov_time:>15.4f}s {wrong:>15}")
@@ -0,0 +1,28 @@
+import pathlib
+import statistics
+import subprocess
+import sys
+
+# time to import the lexer modules in a fresh interpreter, with and without touching the module level automata
+
+LEXER: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "Lexer"
+
+SNIPPETS: dict[str, str] = {
+    "import numpy": "import numpy",
+    "import RegexGrammar": "import RegexGrammar",
+    "import DFA": "import DFA",
+    "import DFA + first use": "import DFA; DFA.identifier.run('x'); DFA.integer.run('1')",
+}
+
+def measure(snippet: str, repeat: int = 7) -> float:
+    code: str = f"import sys, time; sys.path.insert(0, {str(LEXER)!r}); t = time.perf_counter(); {snippet}; print(time.perf_counter() - t)"
+    times: list[float] = []
+    for i in range(repeat):
+        result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+        times.append(float(result.stdout))
+    return statistics.median(times)
+
+if __name__ == "__main__":
+
+    for name, snippet in SNIPPETS.items():
+        print(f"{name:>24} {measure(snippet) * 1000:>8.1f} ms")
@@ -0,0 +1,95 @@
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import Grammar as G
+import Parser as P
+
+# LALR(1) against canonical LR(1) table generation on a grammar for a subset of C
+# symbols are separated by spaces, nonterminals start with an upper case letter
+
+C_GRAMMAR: list[str] = [
+    "Program ::= ExternalList",
+    "ExternalList ::= External", "ExternalList ::= ExternalList External",
+    "External ::= FunctionDef", "External ::= Declaration",
+    "FunctionDef ::= Type Declarator CompoundStmt",
+    "Declaration ::= Type InitList ;", "Declaration ::= Type ;",
+    "Declaration ::= struct id { FieldList } ;", "Declaration ::= typedef Type Declarator ;",
+    "FieldList ::= Field", "FieldList ::= FieldList Field",
+    "Field ::= Type Declarator ;",
+    "Type ::= Base", "Type ::= const Base", "Type ::= unsigned Base", "Type ::= struct id",
+    "Base ::= int", "Base ::= char", "Base ::= void", "Base ::= float", "Base ::= double", "Base ::= long", "Base ::= short",
+    "InitList ::= Init", "InitList ::= InitList , Init",
+    "Init ::= Declarator", "Init ::= Declarator = Assign", "Init ::= Declarator = { ArgList }",
+    "Declarator ::= Direct", "Declarator ::= Pointer Direct",
+    "Direct ::= id", "Direct ::= ( Declarator )",
+    "Direct ::= Direct [ ]", "Direct ::= Direct [ int_lit ]",
+    "Direct ::= Direct ( )", "Direct ::= Direct ( Params )",
+    "Params ::= Param", "Params ::= Params , Param",
+    "Param ::= Type Declarator", "Param ::= TypeName",
+    "TypeName ::= Type", "TypeName ::= Type Pointer",
+    "Pointer ::= *", "Pointer ::= * Pointer",
+    "CompoundStmt ::= { }", "CompoundStmt ::= { BlockItems }",
+    "BlockItems ::= BlockItem", "BlockItems ::= BlockItems BlockItem",
+    "BlockItem ::= Declaration", "BlockItem ::= Stmt",
+    "Stmt ::= CompoundStmt", "Stmt ::= Expr ;", "Stmt ::= ;",
+    "Stmt ::= if ( Expr ) Stmt", "Stmt ::= if ( Expr ) Stmt else Stmt",
+    "Stmt ::= while ( Expr ) Stmt", "Stmt ::= do Stmt while ( Expr ) ;",
+    "Stmt ::= for ( OptExpr ; OptExpr ; OptExpr ) Stmt",
+    "Stmt ::= return ;", "Stmt ::= return Expr ;", "Stmt ::= break ;", "Stmt ::= continue ;",
+    "Stmt ::= switch ( Expr ) Stmt", "Stmt ::= case Cond : Stmt", "Stmt ::= default : Stmt",
+    "Stmt ::= goto id ;", "Stmt ::= id : Stmt",
+    "OptExpr ::= Expr", "OptExpr ::=",
+    "Expr ::= Assign", "Expr ::= Expr , Assign",
+    "Assign ::= Cond", "Assign ::= Unary AssignOp Assign",
+    "AssignOp ::= =", "AssignOp ::= +=", "AssignOp ::= -=", "AssignOp ::= *=", "AssignOp ::= /=", "AssignOp ::= %=",
+    "AssignOp ::= &=", "AssignOp ::= |=", "AssignOp ::= ^=", "AssignOp ::= <<=", "AssignOp ::= >>=",
+    "Cond ::= LogOr", "Cond ::= LogOr ? Expr : Cond",
+    "LogOr ::= LogAnd", "LogOr ::= LogOr || LogAnd",
+    "LogAnd ::= BitOr", "LogAnd ::= LogAnd && BitOr",
+    "BitOr ::= BitXor", "BitOr ::= BitOr | BitXor",
+    "BitXor ::= BitAnd", "BitXor ::= BitXor ^ BitAnd",
+    "BitAnd ::= Equality", "BitAnd ::= BitAnd & Equality",
+    "Equality ::= Relation", "Equality ::= Equality == Relation", "Equality ::= Equality != Relation",
+    "Relation ::= Shift", "Relation ::= Relation < Shift", "Relation ::= Relation > Shift",
+    "Relation ::= Relation <= Shift", "Relation ::= Relation >= Shift",
+    "Shift ::= Additive", "Shift ::= Shift << Additive", "Shift ::= Shift >> Additive",
+    "Additive ::= Multiplicative", "Additive ::= Additive + Multiplicative", "Additive ::= Additive - Multiplicative",
+    "Multiplicative ::= Cast", "Multiplicative ::= Multiplicative * Cast",
+    "Multiplicative ::= Multiplicative / Cast", "Multiplicative ::= Multiplicative % Cast",
+    "Cast ::= Unary", "Cast ::= ( TypeName ) Cast",
+    "Unary ::= Postfix", "Unary ::= ++ Unary", "Unary ::= -- Unary", "Unary ::= UnaryOp Cast",
+    "Unary ::= sizeof Unary", "Unary ::= sizeof ( TypeName )",
+    "UnaryOp ::= &", "UnaryOp ::= *", "UnaryOp ::= +", "UnaryOp ::= -", "UnaryOp ::= ~", "UnaryOp ::= !",
+    "Postfix ::= Primary", "Postfix ::= Postfix [ Expr ]", "Postfix ::= Postfix ( )", "Postfix ::= Postfix ( ArgList )",
+    "Postfix ::= Postfix . id", "Postfix ::= Postfix -> id", "Postfix ::= Postfix ++", "Postfix ::= Postfix --",
+    "Primary ::= id", "Primary ::= int_lit", "Primary ::= float_lit", "Primary ::= string_lit", "Primary ::= ( Expr )",
+    "ArgList ::= Assign", "ArgList ::= ArgList , Assign",
+]
+
+def to_rule(v: str) -> G.Rule:
+    lhs, rhs = v.split("::=")
+    symbols: list[G.Symbol] = [G.NonTerminal(x) if x[0].isupper() else G.Terminal(x) for x in rhs.split()]
+    return G.Rule(G.NonTerminal(lhs.strip()), G.String(symbols or [G.EMPTY]))
+
+def c_grammar() -> G.Grammar:
+    return G.rules2grammar([to_rule(x) for x in C_GRAMMAR], G.NonTerminal("Program"))
+
+if __name__ == "__main__":
+
+    grammar: G.Grammar = c_grammar()
+    print(f"{len(grammar.rules)} rules, {len(grammar.terminals)} terminals, {len(grammar.nonterminals)} nonterminals")
+
+    t = time.perf_counter()
+    lalr: P.ParseTable = P.build_lalr_table(grammar)
+    print(f"LALR(1):        {len(lalr.action):>6} states {time.perf_counter() - t:>8.3f}s")
+    for conflict in lalr.conflicts:
+        print("  " + str(conflict))
+
+    # the canonical generator accepts on the last symbol of the starting rule, so it gets an explicit end marker
+    rules: list[G.Rule] = [to_rule("Start ::= Program $")] + [to_rule(x) for x in C_GRAMMAR]
+    t = time.perf_counter()
+    canonical: P.ParseTable = P.build_table(G.rules2grammar(rules, G.NonTerminal("Start")))
+    print(f"canonical LR(1): {len(canonical.action):>5} states {time.perf_counter() - t:>8.3f}s")
@@ -0,0 +1,30 @@
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import FiniteAutomaton as FA
+import RegexToFA as R2FA
+
+# state counts of the shipped token dfas and a few larger automata before and after minimization
+
+REGEXES: dict[str, tuple[str, str]] = {
+    "identifier": ("(([[a]-[z]]|[[A]-[Z]]|[_])+)(([[a]-[z]]|[[A]-[Z]]|[[0]-[9]]|[_])*)", "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"),
+    "integer": ("(([-]|[+])?)((([0]([x]|[X]))((([_]?)([[0]-[9]]|[[a]-[f]]|[[A]-[F]]))+))|(([0]([b]|[B]))((([_]?)([0]|[1]))+))|(([0]([o]|[O]))((([_]?)([[0]-[7]]))+))|(([[1]-[9]]+)(([_]?)([[0]-[9]]))*))", "0123456789abcdefABCDEFxXoO_+-"),
+    "keywords": ("([i][f])|([i][n][t])|([f][o][r])|([f][l][o][a][t])|([w][h][i][l][e])", "abcdefghijklmnopqrstuvwxyz"),
+    "suffix": ("([a]|[b])*[a]" + "([a]|[b])" * 12, "ab"),
+}
+
+if __name__ == "__main__":
+
+    print(f"{'dfa':>12} {'before':>8} {'after':>8} {'minimize':>10}")
+    for name, (regex, alphabet) in REGEXES.items():
+        fa = R2FA.regex2FA(regex, alphabet)
+        transitions, accept = FA.subset_construction(fa, alphabet)
+
+        t = time.perf_counter()
+        minimal, minimal_accept = FA.minimize(transitions, accept)
+        elapsed: float = time.perf_counter() - t
+
+        print(f"{name:>12} {len(transitions):>8} {len(minimal):>8} {elapsed:>9.4f}s")
@@ -0,0 +1,45 @@
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import DFA as D
+import RegexParser as RP
+
+# wall clock time of compile_many on an empty dfa cache for a growing number of worker processes
+
+ALPHABET: str = "abcdefgh"
+
+def specification(count: int) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    for i in range(count):
+        a, b = ALPHABET[i % len(ALPHABET)], ALPHABET[(i * 3 + 1) % len(ALPHABET)]
+        # every regex needs a few thousand dfa states
+        regex: str = "([" + a + "]|[" + b + "]|[[a]-[h]])*[" + a + "]" + ("([" + b + "]|[[a]-[d]])") * (7 + i % 3)
+        tokens.append((regex, ALPHABET))
+    return tokens
+
+if __name__ == "__main__":
+
+    tokens: list[tuple[str, str]] = specification(int(sys.argv[1]) if len(sys.argv) > 1 else 16)
+    RP.regex_table(ALPHABET)
+
+    cores: int = os.cpu_count() or 1
+    counts: list[int] = sorted(set([1, 2, 4, 8, cores]))
+    print(f"{len(tokens)} regexes, {cores} cores")
+
+    serial: float | None = None
+    for workers in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            D.DFA_CACHE_DIRECTORY = pathlib.Path(directory)
+            D.DFA._DFA__loaded.clear()
+
+            t = time.perf_counter()
+            D.compile_many(tokens, workers)
+            elapsed: float = time.perf_counter() - t
+
+        serial = serial or elapsed
+        print(f"{workers:>3} workers {elapsed:>8.2f}s {serial / elapsed:>6.2f}x")
@@ -0,0 +1,92 @@
+import pathlib
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import Grammar as G
+import Lexer as L
+import Parser as P
+
+# lexing and parsing a generated file of assignments, either as one streaming pipeline or
+# with the whole token list materialized first, every mode runs in its own process
+# usage: python benchmarks/parse_stream.py [megabytes]
+
+LETTERS: str = "abcdefghijklmnopqrstuvwxyz"
+DIGITS: str = "0123456789"
+
+TOKENS: list[tuple[str, str, str]] = [
+    ("num", "[[0]-[9]]+", DIGITS),
+    ("id", "[[a]-[z]]([[a]-[z]]|[[0]-[9]])*", LETTERS + DIGITS),
+    ("+", "[+]", "+"), ("-", "[-]", "-"), ("*", "[*]", "*"), ("/", "[/]", "/"),
+    ("(", "[(]", "("), (")", "[)]", ")"), ("=", "[=]", "="), (";", "[;]", ";"),
+    ("space", "([ ]|[\n])+", " \n"),
+]
+
+def rule(lhs: str, rhs: str, application = None) -> G.Rule:
+    symbols: list[G.Symbol] = [G.NonTerminal(x) if x[0].isupper() else G.Terminal(x) for x in rhs.split()]
+    return G.Rule(G.NonTerminal(lhs), G.String(symbols or [G.EMPTY]), application)
+
+# the semantic actions count statements, so the value stack stays flat however long the input is
+def grammar() -> G.Grammar:
+    keep = lambda x: x[0]
+    return G.rules2grammar([
+        rule("Program", "Stmts", keep),
+        rule("Stmts", "", lambda x: 0),
+        rule("Stmts", "Stmts Stmt", lambda x: x[0] + 1),
+        rule("Stmt", "id = Expr ;"),
+        rule("Expr", "Expr + Term"), rule("Expr", "Expr - Term"), rule("Expr", "Term"),
+        rule("Term", "Term * Factor"), rule("Term", "Term / Factor"), rule("Term", "Factor"),
+        rule("Factor", "num"), rule("Factor", "id"), rule("Factor", "( Expr )"),
+    ], G.NonTerminal("Program"))
+
+def expression(rnd: random.Random, depth: int) -> str:
+    if depth == 0 or rnd.random() < 0.3:
+        return rnd.choice([str(rnd.randrange(1000)), rnd.choice(["x", "total", "y2", "count"])])
+    if rnd.random() < 0.2:
+        return "(" + expression(rnd, depth - 1) + ")"
+    return expression(rnd, depth - 1) + " " + rnd.choice("+-*/") + " " + expression(rnd, depth - 1)
+
+def generate(path: pathlib.Path, megabytes: int) -> None:
+    rnd = random.Random(0)
+    with open(path, "w") as f:
+        size: int = 0
+        while size < megabytes * 1024 * 1024:
+            line: str = rnd.choice(["x", "total", "y2"]) + " = " + expression(rnd, 4) + ";\n"
+            f.write(line)
+            size += len(line)
+
+def run(mode: str, path: str) -> None:
+    lexer = L.Lexer(TOKENS)
+    table: P.ParseTable = P.build_lalr_table(grammar())
+
+    t = time.perf_counter()
+    with open(path) as f:
+        if mode == "whole":
+            tokens = [token for token in lexer.tokenize(f.read()) if token[0] != "space"]
+        else:
+            tokens = (token for token in lexer.tokenize_stream(f) if token[0] != "space")
+        statements: int = P.parse(table, tokens)
+    elapsed: float = time.perf_counter() - t
+
+    megabytes: float = pathlib.Path(path).stat().st_size / 1e6
+    rss: float = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>6} {statements:>10} statements {megabytes / elapsed:>8.2f} MB/s {rss:>8.1f} MB peak rss")
+
+if __name__ == "__main__":
+
+    if len(sys.argv) == 3:
+        run(sys.argv[1], sys.argv[2])
+        sys.exit()
+
+    megabytes: int = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "input.txt"
+        generate(path, megabytes)
+        print(f"{megabytes} MB input")
+        for mode in ["whole", "stream"]:
+            subprocess.run([sys.executable, __file__, mode, str(path)], check=True)
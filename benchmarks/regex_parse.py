@@ -0,0 +1,41 @@
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+sys.setrecursionlimit(100000)
+
+import RegexParser as RP
+
+# parse time of regex_parse for regexes of growing length, the table is built before timing
+
+ALPHABET: str = "abc"
+PIECES: list[str] = ["[a]", "([b]|[c])*", "[[a]-[c]]+", "([a]?)"]
+
+def make_regex(length: int) -> str:
+    result: str = ""
+    i: int = 0
+    while len(result) < length:
+        result += PIECES[i % len(PIECES)]
+        i += 1
+    return result
+
+def bench(value: str, repeat: int = 3) -> float:
+    best: float = float("inf")
+    for i in range(repeat):
+        t = time.perf_counter()
+        RP.regex_parse(value, ALPHABET)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+if __name__ == "__main__":
+
+    t = time.perf_counter()
+    RP.regex_table(ALPHABET)
+    print(f"table construction: {time.perf_counter() - t:.3f}s")
+
+    print(f"{'length':>8} {'seconds':>10} {'us/char':>10}")
+    for length in [10, 100, 1000, 10000]:
+        value: str = make_regex(length)
+        elapsed: float = bench(value)
+        print(f"{len(value):>8} {elapsed:>10.5f} {elapsed / len(value) * 1e6:>10.2f}")
@@ -0,0 +1,82 @@
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import numpy as np
+import DFA as D
+import Lexer as L
+import Parser as P
+import SparseTable as SP
+from lalr import c_grammar
+import parse_stream as PS
+
+# memory and lookup speed of row displacement tables against the dense ones
+# the shipped dfas are measured with their character classes and with one column per character
+
+LOOKUPS: int = 200000
+STATEMENTS: int = 3000
+
+def scalar_time(get, rows: list[int], columns: list[int]) -> float:
+    t = time.perf_counter()
+    for r, c in zip(rows, columns):
+        get(r, c)
+    return (time.perf_counter() - t) / len(rows) * 1e9
+
+def vector_time(get_many, rows: np.ndarray, columns: np.ndarray) -> float:
+    t = time.perf_counter()
+    get_many(rows, columns)
+    return (time.perf_counter() - t) / len(rows) * 1e9
+
+def report(name: str, dense: np.ndarray, sparse: list[SP.SparseTable]) -> None:
+    rnd = random.Random(0)
+    rows: list[int] = [rnd.randrange(dense.shape[0]) for i in range(LOOKUPS)]
+    columns: list[int] = [rnd.randrange(dense.shape[1]) for i in range(LOOKUPS)]
+    rows_array: np.ndarray = np.array(rows, dtype=np.int32)
+    columns_array: np.ndarray = np.array(columns, dtype=np.int32)
+
+    table: SP.SparseTable = sparse[0]
+    size: int = sum(x.nbytes() for x in sparse)
+    lists: list[list[int]] = dense.tolist()
+
+    print(f"{name:>28} {dense.shape[0]:>5}x{dense.shape[1]:<4} {dense.nbytes:>8} {size:>8} {size / dense.nbytes:>6.2f}"
+          f" {scalar_time(lambda r, c: lists[r][c], rows, columns):>7.0f} {scalar_time(dense.item, rows, columns):>7.0f}"
+          f" {scalar_time(table.get, rows, columns):>7.0f}"
+          f" {vector_time(lambda r, c: dense[r, c], rows_array, columns_array):>6.1f} {vector_time(table.get_many, rows_array, columns_array):>6.1f}")
+
+# whole parses through the dense lists and through the compressed tables, on the same tokens
+def report_parse() -> None:
+    rnd = random.Random(0)
+    text: str = "".join(rnd.choice(["x", "total", "y2"]) + " = " + PS.expression(rnd, 4) + ";\n" for i in range(STATEMENTS))
+    tokens: list[tuple[str, int, int]] = [token for token in L.Lexer(PS.TOKENS).tokenize(text) if token[0] != "space"]
+
+    table: P.ParseTable = P.build_lalr_table(PS.grammar())
+    for name, parse_table in [("dense", table), ("sparse", SP.SparseParseTable(table, False)), ("sparse, default red.", SP.SparseParseTable(table))]:
+        t = time.perf_counter()
+        statements: int = P.parse(parse_table, tokens)
+        elapsed: float = time.perf_counter() - t
+        assert statements == STATEMENTS
+        print(f"{'parse, ' + name:>28} {len(tokens):>10} tokens {elapsed / len(tokens) * 1e9:>8.0f} ns/token")
+
+if __name__ == "__main__":
+
+    print(f"{'table':>28} {'shape':>10} {'dense B':>8} {'sparse B':>8} {'ratio':>6}"
+          f" {'list ns':>7} {'item ns':>7} {'get ns':>7} {'np ns':>6} {'sp ns':>6}")
+
+    for name, dfa in [("identifier", D.identifier), ("integer", D.integer)]:
+        report(name + " dfa, classes", dfa.transitions, [SP.compress_dfa(dfa.transitions)])
+        characters: np.ndarray = np.ascontiguousarray(dfa.transitions[:, dfa.classes])
+        report(name + " dfa, characters", characters, [SP.compress_dfa(characters)])
+
+    table: P.ParseTable = P.build_lalr_table(c_grammar())
+    action: np.ndarray = np.array(table.action, dtype=np.int32)
+    goto: np.ndarray = np.array(table.goto, dtype=np.int32)
+    for default_reductions in [False, True]:
+        sparse_action, sparse_goto = SP.compress_parse_table(table, default_reductions)
+        label: str = "C LALR action" + (", default red." if default_reductions else "")
+        report(label, action, [sparse_action])
+        print(f"{'':>28} action + goto: {action.nbytes + goto.nbytes} -> {sparse_action.nbytes() + sparse_goto.nbytes()} bytes")
+
+    report_parse()
@@ -0,0 +1,65 @@
+import mmap
+import pathlib
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+
+import DFA as D
+import Lexer as L
+
+# throughput and peak rss of lexing a generated file, every mode runs in its own process
+# usage: python benchmarks/stream_lexer.py [megabytes]
+
+TOKENS: list[tuple[str, str, str]] = [("integer", *D.INTEGER), ("identifier", *D.IDENTIFIER), ("space", "([ ]|[\n])+", " \n")]
+PIECES: list[str] = ["counter", "x_1", "0x1F", "-12", "+0b1_0", "value9", "0o17", "12_345", "i"]
+
+def generate(path: pathlib.Path, megabytes: int) -> None:
+    rnd = random.Random(0)
+    with open(path, "w") as f:
+        for i in range(megabytes * 1024):
+            line: list[str] = []
+            while sum(len(x) + 1 for x in line) < 1000:
+                line.append(rnd.choice(PIECES))
+            f.write(" ".join(line).ljust(1023) + "\n")
+
+def run(mode: str, path: str) -> None:
+    lexer = L.Lexer(TOKENS)
+
+    t = time.perf_counter()
+    count: int = 0
+    if mode == "whole":
+        with open(path) as f:
+            for token in lexer.tokenize(f.read()):
+                count += 1
+    elif mode == "file":
+        with open(path) as f:
+            for token in lexer.tokenize_stream(f):
+                count += 1
+    elif mode == "mmap":
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for token in lexer.tokenize_stream(m):
+                count += 1
+    elapsed: float = time.perf_counter() - t
+
+    megabytes: float = pathlib.Path(path).stat().st_size / 1e6
+    rss: float = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>6} {count:>10} {megabytes / elapsed:>8.2f} MB/s {rss:>8.1f} MB peak rss")
+
+if __name__ == "__main__":
+
+    if len(sys.argv) == 3:
+        run(sys.argv[1], sys.argv[2])
+        sys.exit()
+
+    megabytes: int = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "input.txt"
+        generate(path, megabytes)
+        print(f"{megabytes} MB input")
+        for mode in ["whole", "file", "mmap"]:
+            subprocess.run([sys.executable, __file__, mode, str(path)], check=True)
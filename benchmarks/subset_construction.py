@@ -0,0 +1,57 @@
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Lexer"))
+sys.setrecursionlimit(1000000)
+
+import FiniteAutomaton as FA
+import RegexToFA as R2FA
+
+# ([a]|[b])*[a]([a]|[b])^k needs 2^(k+1) dfa states
+
+def make_regex(k: int) -> str:
+    return "([a]|[b])*[a]" + "([a]|[b])" * k
+
+# the recursive construction with linear lookups that subset_construction replaced
+def recursive_construction(fa: FA.FiniteAutomaton, alphabet: str) -> tuple[list[list[int]], list[int]]:
+
+    states: dict[int, set[int]] = {0: fa.closure(fa.start)}
+    transitions: list[list[int]] = [[-1 for x in alphabet]]
+    accept: list[int] = []
+
+    def rec(lookat: int) -> None:
+        state = states[lookat]
+        if fa.accepts(state):
+            accept.append(lookat)
+        for c in alphabet:
+            next_state = fa.next_state(state, c)
+            if next_state in states.values():
+                transitions[lookat][alphabet.index(c)] = list(states.values()).index(next_state)
+                continue
+            new_id = len(states)
+            states[new_id] = next_state
+            transitions.append([-1 for x in alphabet])
+            transitions[lookat][alphabet.index(c)] = new_id
+            rec(new_id)
+
+    rec(0)
+    return transitions, accept
+
+def bench(construction, fa: FA.FiniteAutomaton) -> tuple[int, float]:
+    t = time.perf_counter()
+    transitions, accept = construction(fa, "ab")
+    return len(transitions), time.perf_counter() - t
+
+if __name__ == "__main__":
+
+    print(f"{'k':>3} {'states':>8} {'recursive':>10} {'worklist':>10}")
+    for k in [4, 6, 8, 10, 12, 14, 16]:
+        fa = R2FA.regex2FA(make_regex(k), "ab")
+
+        states, new = bench(FA.subset_construction, fa)
+        old: str = "-"
+        if k <= 12:
+            old = f"{bench(recursive_construction, fa)[1]:.3f}"
+
+        print(f"{k:>3} {states:>8} {old:>10} {new:>10.3f}")